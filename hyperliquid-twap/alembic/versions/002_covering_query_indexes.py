@@ -0,0 +1,55 @@
+"""Covering indexes for API query paths
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns projected by /api/v1/twaps, so the wallet scan can be index-only
+WALLET_TS_INCLUDE = [
+    'twap_id',
+    'asset',
+    'side',
+    'status',
+    'duration_minutes',
+    'size_executed',
+    'notional_executed',
+]
+
+
+def upgrade() -> None:
+    """Replace (wallet, ts) and (twap_id) indexes with descending composites."""
+    op.create_index(
+        'twap_status_wallet_ts_desc_idx',
+        'twap_status',
+        ['wallet', sa.text('ts DESC')],
+        postgresql_include=WALLET_TS_INCLUDE,
+    )
+    op.create_index(
+        'twap_status_twap_id_ts_desc_idx',
+        'twap_status',
+        ['twap_id', sa.text('ts DESC')],
+    )
+    
+    # Both are prefixes of the new indexes
+    op.drop_index('twap_status_wallet_ts_idx', table_name='twap_status')
+    op.drop_index('twap_status_twap_id_idx', table_name='twap_status')
+
+
+def downgrade() -> None:
+    """Restore the original (wallet, ts) and (twap_id) indexes."""
+    op.create_index('twap_status_wallet_ts_idx', 'twap_status', ['wallet', 'ts'])
+    op.create_index('twap_status_twap_id_idx', 'twap_status', ['twap_id'])
+    op.drop_index('twap_status_twap_id_ts_desc_idx', table_name='twap_status')
+    op.drop_index('twap_status_wallet_ts_desc_idx', table_name='twap_status')
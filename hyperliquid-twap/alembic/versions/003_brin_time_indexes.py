@@ -0,0 +1,51 @@
+"""BRIN indexes for time-ordered scans
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add BRIN indexes on ingest-ordered timestamps and a partial success index."""
+    # Rows arrive in roughly monotonic time order, so BRIN ranges stay tight
+    op.create_index(
+        'twap_status_ts_brin_idx',
+        'twap_status',
+        ['ts'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    op.create_index(
+        'etl_ingested_at_brin_idx',
+        'etl_s3_ingest_log',
+        ['ingested_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 16},
+    )
+    
+    # Health check looks up the latest successful ingest only
+    op.create_index(
+        'etl_log_success_recent_idx',
+        'etl_s3_ingest_log',
+        [sa.text('ingested_at DESC')],
+        postgresql_where=sa.text('error_text IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop BRIN and partial indexes."""
+    op.drop_index('etl_log_success_recent_idx', table_name='etl_s3_ingest_log')
+    op.drop_index('etl_ingested_at_brin_idx', table_name='etl_s3_ingest_log')
+    op.drop_index('twap_status_ts_brin_idx', table_name='twap_status')
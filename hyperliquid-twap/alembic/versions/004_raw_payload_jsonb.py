@@ -0,0 +1,42 @@
+"""Store raw_payload as JSONB
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Convert twap_status.raw_payload from JSON to JSONB."""
+    op.alter_column(
+        'twap_status',
+        'raw_payload',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=postgresql.JSON(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using='raw_payload::jsonb',
+    )
+
+
+def downgrade() -> None:
+    """Convert twap_status.raw_payload back to JSON."""
+    op.alter_column(
+        'twap_status',
+        'raw_payload',
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using='raw_payload::json',
+    )
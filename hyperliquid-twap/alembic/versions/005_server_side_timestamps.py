@@ -0,0 +1,29 @@
+"""Server-side now() defaults for insert timestamps
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Default inserted_at and ingested_at to now() in the database."""
+    op.alter_column('twap_status', 'inserted_at', server_default=sa.text('now()'))
+    op.alter_column('etl_s3_ingest_log', 'ingested_at', server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Drop the now() defaults."""
+    op.alter_column('etl_s3_ingest_log', 'ingested_at', server_default=None)
+    op.alter_column('twap_status', 'inserted_at', server_default=None)
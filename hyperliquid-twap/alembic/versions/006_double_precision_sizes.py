@@ -0,0 +1,46 @@
+"""Store size and notional columns as DOUBLE PRECISION
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SIZE_COLUMNS = ('size_requested', 'size_executed', 'notional_executed')
+
+
+def upgrade() -> None:
+    """Convert twap_status size columns from NUMERIC to DOUBLE PRECISION."""
+    for column in SIZE_COLUMNS:
+        op.alter_column(
+            'twap_status',
+            column,
+            type_=postgresql.DOUBLE_PRECISION(),
+            existing_type=sa.Numeric(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::double precision',
+        )
+
+
+def downgrade() -> None:
+    """Convert twap_status size columns back to NUMERIC."""
+    for column in SIZE_COLUMNS:
+        op.alter_column(
+            'twap_status',
+            column,
+            type_=sa.Numeric(),
+            existing_type=postgresql.DOUBLE_PRECISION(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::numeric',
+        )
@@ -0,0 +1,30 @@
+"""Flag ingest log entries that count toward the ingest watermark
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add in_watermark, true for existing entries."""
+    op.add_column(
+        'etl_s3_ingest_log',
+        sa.Column('in_watermark', sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop in_watermark."""
+    op.drop_column('etl_s3_ingest_log', 'in_watermark')
@@ -0,0 +1,43 @@
+"""In-process TTL cache for API responses."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        value, expiry = entry
+        if time.monotonic() >= expiry:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entries."""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
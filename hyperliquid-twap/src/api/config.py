@@ -11,9 +11,22 @@ class APIConfig:
     """API configuration from environment variables."""
 
     DATABASE_URL = os.getenv("DATABASE_URL")
+    
+    # Connection pool sizing (per worker process)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "32"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "16"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("API_PORT", "8000"))
     
+    # Seconds to reuse a successful /healthz database check
+    HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "2"))
+    
+    # In-process cache of /api/v1/twaps responses (TTL 0 disables it)
+    TWAPS_CACHE_TTL = float(os.getenv("TWAPS_CACHE_TTL", "3"))
+    TWAPS_CACHE_SIZE = int(os.getenv("TWAPS_CACHE_SIZE", "1024"))
+    
     @classmethod
     def validate(cls):
         """Validate required configuration."""
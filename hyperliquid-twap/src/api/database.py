@@ -1,25 +1,57 @@
 """Database connection for FastAPI."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from .config import APIConfig
 
-# Create async engine
+logger = logging.getLogger(__name__)
+
+# Create async engine with a pool sized for concurrent requests
 engine = create_async_engine(
     APIConfig.DATABASE_URL,
     echo=False,
+    pool_size=APIConfig.DB_POOL_SIZE,
+    max_overflow=APIConfig.DB_MAX_OVERFLOW,
+    pool_timeout=APIConfig.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=APIConfig.DB_POOL_RECYCLE,
     future=True
 )
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False
 )
 
 
+async def warm_pool(size: int = APIConfig.DB_POOL_SIZE):
+    """
+    Open pool connections up front so early requests skip connection setup.
+    
+    Failures are logged rather than raised so the API can still start and
+    report a degraded /healthz while the database is unavailable.
+    
+    Args:
+        size: Number of connections to open concurrently
+    """
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(size):
+                tg.create_task(_ping())
+        logger.info(f"Warmed database pool with {size} connections")
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e!r}")
+
+
 async def get_db() -> AsyncSession:
     """
     Dependency for getting database session.
@@ -1,16 +1,25 @@
 """FastAPI application main module."""
 
+import asyncio
+import base64
+import binascii
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select, text
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from sqlalchemy import RowMapping, Text, and_, cast, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import ETLIngestLog, TWAPStatus
-from .database import get_db
+from .cache import TTLCache
+from .config import APIConfig
+from .database import engine, get_db, warm_pool
 from .metrics import metrics, metrics_middleware
 from .models import (
     ExecutedData,
@@ -21,10 +30,60 @@ from .models import (
     TWAPsResponse,
 )
 
+# Rows fetched per round-trip when streaming large result sets
+STREAM_BATCH_SIZE = 500
+
+# Size columns are cast to text in SQL so the driver returns the strings
+# the response models expect without a Python-side conversion
+SIZE_REQUESTED_TEXT = cast(TWAPStatus.size_requested, Text).label("size_requested")
+SIZE_EXECUTED_TEXT = cast(TWAPStatus.size_executed, Text).label("size_executed")
+NOTIONAL_EXECUTED_TEXT = cast(TWAPStatus.notional_executed, Text).label("notional_executed")
+
+# Columns needed to build a TWAPData summary
+TWAP_SUMMARY_COLUMNS = (
+    TWAPStatus.twap_id,
+    TWAPStatus.asset,
+    TWAPStatus.side,
+    TWAPStatus.status,
+    TWAPStatus.duration_minutes,
+    TWAPStatus.ts,
+    SIZE_EXECUTED_TEXT,
+    NOTIONAL_EXECUTED_TEXT,
+)
+TWAP_SUMMARY_COLUMNS_WITH_RAW = TWAP_SUMMARY_COLUMNS + (TWAPStatus.raw_payload,)
+
+# Columns needed to build a TWAPRow
+TWAP_ROW_COLUMNS = (
+    TWAPStatus.wallet,
+    TWAPStatus.ts,
+    TWAPStatus.asset,
+    TWAPStatus.side,
+    SIZE_REQUESTED_TEXT,
+    SIZE_EXECUTED_TEXT,
+    NOTIONAL_EXECUTED_TEXT,
+    TWAPStatus.status,
+    TWAPStatus.duration_minutes,
+)
+TWAP_ROW_COLUMNS_WITH_RAW = TWAP_ROW_COLUMNS + (TWAPStatus.raw_payload,)
+
+# Serialized /api/v1/twaps bodies keyed by query parameters
+twaps_cache = TTLCache(maxsize=APIConfig.TWAPS_CACHE_SIZE, ttl=APIConfig.TWAPS_CACHE_TTL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-warm the database pool on startup and release it on shutdown."""
+    await warm_pool()
+    yield
+    await engine.dispose()
+
+
 app = FastAPI(
     title="Hyperliquid TWAP Data Service",
     description="API for querying Hyperliquid TWAP data from Artemis S3 bucket",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -49,6 +108,53 @@ app.add_middleware(
 app.middleware("http")(metrics_middleware)
 
 
+def _build_twap_data(row: RowMapping, raw: Dict[str, Any]) -> TWAPData:
+    """
+    Build the API representation of a TWAP from its latest status row.
+    
+    Values come straight from typed columns, so validation is skipped.
+    """
+    return TWAPData.model_construct(
+        twap_id=row["twap_id"],
+        asset=row["asset"],
+        side=row["side"],
+        status=row["status"],
+        duration_minutes=row["duration_minutes"],
+        latest_ts=row["ts"],
+        executed=ExecutedData.model_construct(
+            size=row["size_executed"],
+            notional=row["notional_executed"]
+        ),
+        raw=raw
+    )
+
+
+def _build_twap_history(row: RowMapping, all_rows: List[dict]) -> TWAPData:
+    """Build a TWAP whose raw data includes the payloads of every row."""
+    return _build_twap_data(
+        row,
+        {
+            "latest": row["raw_payload"] or {},
+            "all_rows": all_rows
+        }
+    )
+
+
+def _encode_cursor(twap: TWAPData) -> str:
+    """Encode the sort position of a page's last TWAP as an opaque cursor."""
+    position = {"ts": twap.latest_ts.isoformat(), "id": twap.twap_id}
+    return base64.urlsafe_b64encode(orjson.dumps(position)).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor from _encode_cursor into (latest_ts, twap_id)."""
+    try:
+        position = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(position["ts"]), str(position["id"])
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
 @app.get("/api/v1/twaps", response_model=TWAPsResponse)
 async def get_twaps(
     wallet: str = Query(..., description="Wallet address"),
@@ -57,143 +163,210 @@ async def get_twaps(
     asset: Optional[str] = Query(None, description="Filter by asset/coin"),
     latest_per_twap: bool = Query(True, description="Return only latest row per TWAP ID"),
     limit: int = Query(500, ge=1, le=5000, description="Maximum number of TWAPs to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination (number of TWAPs to skip)"),
+    offset: int = Query(0, ge=0, description="Deprecated: number of TWAPs to skip; use cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_raw: bool = Query(False, description="Include raw parquet payloads in the response"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Query TWAPs by wallet and time range with pagination support.
     
-    Returns TWAPs grouped by twap_id. If latest_per_twap=true, returns only
-    the most recent row per TWAP ID.
+    Returns TWAPs grouped by twap_id, most recently updated first. If
+    latest_per_twap=true, returns only the most recent row per TWAP ID.
+    Raw payloads are only fetched when include_raw=true; otherwise `raw`
+    is empty.
     
     Pagination:
     - Use `limit` to control page size (default 500, max 5000)
-    - Use `offset` to skip TWAPs for pagination (default 0)
-    - Example: offset=0&limit=100 for page 1, offset=100&limit=100 for page 2
+    - When a page is full, pass its `next_cursor` as `cursor` to fetch the next page
+    - `offset` still skips TWAPs but is deprecated: the database has to
+      build and discard every skipped TWAP
+    
+    Identical queries are served from an in-process cache for a few seconds.
     """
-    # Build query
-    query = select(TWAPStatus).where(
+    cache_key = (wallet, start, end, asset, latest_per_twap, limit, offset, cursor, include_raw)
+    body = twaps_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
+    filters = [
         TWAPStatus.wallet == wallet,
         TWAPStatus.ts >= start,
-        TWAPStatus.ts <= end
-    )
+        TWAPStatus.ts <= end,
+    ]
     
     # Add asset filter if provided
     if asset:
-        query = query.where(TWAPStatus.asset == asset)
-    
-    # Order by twap_id and timestamp (descending for latest)
-    query = query.order_by(TWAPStatus.twap_id, TWAPStatus.ts.desc())
-    
-    # Execute query
-    result = await db.execute(query)
-    rows = result.scalars().all()
+        filters.append(TWAPStatus.asset == asset)
     
-    # Group by twap_id
-    twap_groups = {}
-    for row in rows:
-        if row.twap_id not in twap_groups:
-            twap_groups[row.twap_id] = []
-        twap_groups[row.twap_id].append(row)
-    
-    # Build response with pagination
-    twaps = []
-    twap_ids = list(twap_groups.keys())
+    # Latest row per twap_id via DISTINCT ON, paginated server-side
+    latest = (
+        select(*(TWAP_SUMMARY_COLUMNS_WITH_RAW if include_raw else TWAP_SUMMARY_COLUMNS))
+        .where(*filters)
+        .distinct(TWAPStatus.twap_id)
+        .order_by(TWAPStatus.twap_id, TWAPStatus.ts.desc())
+        .subquery()
+    )
+    page_query = (
+        select(latest)
+        .order_by(latest.c.ts.desc(), latest.c.twap_id)
+        .limit(limit)
+        .offset(offset)
+    )
     
-    # Apply offset and limit to twap_ids
-    paginated_twap_ids = twap_ids[offset:offset + limit]
+    # Resume after the cursor's position in (ts DESC, twap_id) order
+    if cursor:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        page_query = page_query.where(
+            or_(
+                latest.c.ts < cursor_ts,
+                and_(latest.c.ts == cursor_ts, latest.c.twap_id > cursor_id),
+            )
+        )
     
-    for twap_id in paginated_twap_ids:
-        twap_rows = twap_groups[twap_id]
+    if latest_per_twap or not include_raw:
+        result = await db.execute(page_query)
+        twaps = [
+            _build_twap_data(row, (row["raw_payload"] or {}) if include_raw else {})
+            for row in result.mappings()
+        ]
+    else:
+        # Join the page back to its history, ordered so each TWAP's rows are
+        # contiguous and its latest row comes first
+        page = page_query.subquery()
+        history_query = (
+            select(page, TWAPStatus.raw_payload.label("history_payload"))
+            .join(TWAPStatus, TWAPStatus.twap_id == page.c.twap_id)
+            .where(*filters)
+            .order_by(page.c.ts.desc(), page.c.twap_id, TWAPStatus.ts.desc())
+        )
         
-        # If latest_per_twap, use only the first row (already sorted desc by ts)
-        if latest_per_twap:
-            latest_row = twap_rows[0]
-            twap_data = TWAPData(
-                twap_id=twap_id,
-                asset=latest_row.asset,
-                side=latest_row.side,
-                status=latest_row.status,
-                duration_minutes=latest_row.duration_minutes,
-                latest_ts=latest_row.ts,
-                executed=ExecutedData(
-                    size=str(latest_row.size_executed) if latest_row.size_executed is not None else None,
-                    notional=str(latest_row.notional_executed) if latest_row.notional_executed is not None else None
-                ),
-                raw=latest_row.raw_payload or {}
-            )
-            twaps.append(twap_data)
-        else:
-            # Return data from latest row but include all rows in raw
-            latest_row = twap_rows[0]
-            twap_data = TWAPData(
-                twap_id=twap_id,
-                asset=latest_row.asset,
-                side=latest_row.side,
-                status=latest_row.status,
-                duration_minutes=latest_row.duration_minutes,
-                latest_ts=latest_row.ts,
-                executed=ExecutedData(
-                    size=str(latest_row.size_executed) if latest_row.size_executed is not None else None,
-                    notional=str(latest_row.notional_executed) if latest_row.notional_executed is not None else None
-                ),
-                raw={
-                    "latest": latest_row.raw_payload or {},
-                    "all_rows": [r.raw_payload for r in twap_rows if r.raw_payload]
-                }
-            )
-            twaps.append(twap_data)
+        result = await db.stream(history_query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        
+        # Single pass: only the current TWAP's payloads are buffered
+        twaps = []
+        latest_row = None
+        all_rows: List[dict] = []
+        async for row in result.mappings():
+            if latest_row is None or row["twap_id"] != latest_row["twap_id"]:
+                if latest_row is not None:
+                    twaps.append(_build_twap_history(latest_row, all_rows))
+                latest_row = row
+                all_rows = []
+            
+            if row["history_payload"]:
+                all_rows.append(row["history_payload"])
+        
+        if latest_row is not None:
+            twaps.append(_build_twap_history(latest_row, all_rows))
     
-    return TWAPsResponse(
+    body = TWAPsResponse(
         wallet=wallet,
         start=start,
         end=end,
-        twaps=twaps
-    )
+        twaps=twaps,
+        next_cursor=_encode_cursor(twaps[-1]) if len(twaps) == limit else None
+    ).model_dump_json().encode()
+    
+    twaps_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/api/v1/twaps/{twap_id}", response_model=TWAPDetailResponse)
 async def get_twap_by_id(
     twap_id: str,
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum number of rows to return"),
+    before_ts: Optional[datetime] = Query(None, description="Only return rows older than this timestamp (cursor)"),
+    include_raw: bool = Query(True, description="Include raw parquet payloads in the response"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all rows for a specific TWAP ID.
+    Get status rows for a specific TWAP ID, newest first.
     
-    Returns complete history of status updates for the TWAP.
+    Pagination:
+    - Use `limit` to control page size (default 1000, max 5000)
+    - When a page is full, pass its `next_cursor` as `before_ts` to fetch the next page
     """
-    # Query all rows for this TWAP ID
-    query = select(TWAPStatus).where(
+    query = select(*(TWAP_ROW_COLUMNS_WITH_RAW if include_raw else TWAP_ROW_COLUMNS)).where(
         TWAPStatus.twap_id == twap_id
-    ).order_by(TWAPStatus.ts.desc())
+    )
     
-    result = await db.execute(query)
-    rows = result.scalars().all()
+    if before_ts:
+        query = query.where(TWAPStatus.ts < before_ts)
     
-    if not rows:
-        raise HTTPException(status_code=404, detail=f"TWAP ID {twap_id} not found")
+    query = query.order_by(TWAPStatus.ts.desc()).limit(limit)
+    
+    # Stream plain rows in batches rather than hydrating ORM objects
+    result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
     
     # Build response
     twap_rows = []
-    for row in rows:
-        twap_row = TWAPRow(
-            wallet=row.wallet,
-            ts=row.ts,
-            asset=row.asset,
-            side=row.side,
-            size_requested=str(row.size_requested) if row.size_requested is not None else None,
-            size_executed=str(row.size_executed) if row.size_executed is not None else None,
-            notional_executed=str(row.notional_executed) if row.notional_executed is not None else None,
-            status=row.status,
-            duration_minutes=row.duration_minutes,
-            raw=row.raw_payload or {}
+    async for row in result.mappings():
+        twap_row = TWAPRow.model_construct(
+            wallet=row["wallet"],
+            ts=row["ts"],
+            asset=row["asset"],
+            side=row["side"],
+            size_requested=row["size_requested"],
+            size_executed=row["size_executed"],
+            notional_executed=row["notional_executed"],
+            status=row["status"],
+            duration_minutes=row["duration_minutes"],
+            raw=(row["raw_payload"] or {}) if include_raw else {}
         )
         twap_rows.append(twap_row)
     
-    return TWAPDetailResponse(
+    if not twap_rows and before_ts is None:
+        raise HTTPException(status_code=404, detail=f"TWAP ID {twap_id} not found")
+    
+    # Serialized by pydantic-core directly, bypassing jsonable_encoder
+    body = TWAPDetailResponse(
         twap_id=twap_id,
-        rows=twap_rows
-    )
+        rows=twap_rows,
+        next_cursor=twap_rows[-1].ts if len(twap_rows) == limit else None
+    ).model_dump_json().encode()
+    
+    return Response(content=body, media_type="application/json")
+
+
+# Last successful health check as ((last_object, last_ingested_at), expiry)
+_health_cache: Tuple[Optional[Tuple[Optional[str], Optional[datetime]]], float] = (None, 0.0)
+_health_lock = asyncio.Lock()
+
+
+async def _get_last_ingest(db: AsyncSession) -> Tuple[Optional[str], Optional[datetime]]:
+    """
+    Check database connectivity and fetch the last successfully ingested object.
+    
+    Successful results are reused for HEALTH_CACHE_TTL seconds so frequent
+    load balancer probes don't hit the database. Errors are never cached.
+    """
+    global _health_cache
+    
+    value, expiry = _health_cache
+    if value is not None and time.monotonic() < expiry:
+        return value
+    
+    async with _health_lock:
+        # Another request may have refreshed the cache while we waited
+        value, expiry = _health_cache
+        if value is not None and time.monotonic() < expiry:
+            return value
+        
+        # Check database connectivity
+        await db.execute(text("SELECT 1"))
+        
+        # Get last ingested object (served by etl_log_success_recent_idx)
+        query = select(ETLIngestLog.s3_object_key, ETLIngestLog.ingested_at).where(
+            ETLIngestLog.error_text.is_(None)
+        ).order_by(ETLIngestLog.ingested_at.desc()).limit(1)
+        
+        result = await db.execute(query)
+        last_log = result.first()
+        
+        value = (last_log.s3_object_key, last_log.ingested_at) if last_log else (None, None)
+        _health_cache = (value, time.monotonic() + APIConfig.HEALTH_CACHE_TTL)
+        return value
 
 
 @app.get("/healthz", response_model=HealthResponse)
@@ -208,22 +381,9 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     last_ingested_at = None
     
     try:
-        # Check database connectivity
-        await db.execute(text("SELECT 1"))
+        last_object, last_ingested_at = await _get_last_ingest(db)
         db_status = "connected"
         
-        # Get last ingested object
-        query = select(ETLIngestLog).where(
-            ETLIngestLog.error_text.is_(None)
-        ).order_by(ETLIngestLog.ingested_at.desc()).limit(1)
-        
-        result = await db.execute(query)
-        last_log = result.scalar_one_or_none()
-        
-        if last_log:
-            last_object = last_log.s3_object_key
-            last_ingested_at = last_log.ingested_at
-        
     except Exception as e:
         db_status = f"error: {str(e)}"
     
@@ -257,7 +417,6 @@ async def get_metrics():
     - ETL run counts and failures
     - Last ETL run timestamp
     """
-    from fastapi.responses import PlainTextResponse
     return PlainTextResponse(
         content=metrics.get_prometheus_metrics(),
         media_type="text/plain"
@@ -1,100 +1,218 @@
 """Prometheus-style metrics tracking."""
 
+import math
+import sys
+import threading
 import time
 from collections import defaultdict
 from contextlib import asynccontextmanager
-from typing import Dict
+from typing import Dict, Iterable, Tuple
 
 from fastapi import Request
 
 
+class DurationHistogram:
+    """
+    Fixed-memory histogram of durations in seconds.
+    
+    Values are counted in logarithmic buckets that grow by 1%, so recording
+    is O(1), memory is constant (~1,800 buckets covering 1us to 60s), and
+    quantiles are accurate to within about 1%.
+    """
+    
+    MIN_VALUE = 1e-6
+    MAX_VALUE = 60.0
+    GROWTH = 1.01
+    
+    _LOG_GROWTH = math.log(GROWTH)
+    NUM_BUCKETS = int(math.log(MAX_VALUE / MIN_VALUE) / _LOG_GROWTH) + 1
+    
+    def __init__(self):
+        self.buckets = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+    
+    def record(self, value: float):
+        """Record a single duration."""
+        if value <= self.MIN_VALUE:
+            index = 0
+        else:
+            index = min(
+                int(math.log(value / self.MIN_VALUE) / self._LOG_GROWTH),
+                self.NUM_BUCKETS - 1
+            )
+        
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+    
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the q-th quantile."""
+        if self.count == 0:
+            return 0.0
+        
+        rank = min(int(self.count * q), self.count - 1)
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen > rank:
+                return self.MIN_VALUE * self.GROWTH ** (index + 1)
+        
+        return self.MAX_VALUE
+
+
+# Static section headers of the Prometheus export
+_REQUESTS_HEADER = (
+    b"# HELP api_requests_total Total number of API requests\n"
+    b"# TYPE api_requests_total counter\n"
+)
+_DURATION_HEADER = (
+    b"\n"
+    b"# HELP api_request_duration_seconds API request duration\n"
+    b"# TYPE api_request_duration_seconds summary\n"
+)
+_ETL_TEMPLATE = (
+    b"\n"
+    b"# HELP etl_runs_total Total number of ETL runs\n"
+    b"# TYPE etl_runs_total counter\n"
+    b"etl_runs_total %d\n"
+    b"\n"
+    b"# HELP etl_failures_total Total number of ETL failures\n"
+    b"# TYPE etl_failures_total counter\n"
+    b"etl_failures_total %d\n"
+    b"\n"
+    b"# HELP etl_last_run_timestamp Unix timestamp of last ETL run\n"
+    b"# TYPE etl_last_run_timestamp gauge\n"
+    b"etl_last_run_timestamp %b\n"
+)
+
+
+# Endpoint labels of the API's routes, pre-registered at startup
+KNOWN_ENDPOINTS = (
+    "GET /api/v1/twaps",
+    "GET /api/v1/twaps/{twap_id}",
+    "GET /healthz",
+    "GET /",
+    "GET /metrics",
+)
+
+
 class MetricsCollector:
     """Simple metrics collector for API requests and ETL runs."""
     
-    def __init__(self):
+    # Seconds a rendered scrape is reused before being rebuilt
+    RENDER_TTL = 1.0
+    
+    def __init__(self, endpoints: Iterable[str] = ()):
         self.request_count: Dict[str, int] = defaultdict(int)
-        self.request_duration: Dict[str, list] = defaultdict(list)
+        self.request_duration: Dict[str, DurationHistogram] = defaultdict(DurationHistogram)
+        
+        # Pre-seed known endpoints so the hot path never inserts new keys
+        for endpoint in endpoints:
+            endpoint = sys.intern(endpoint)
+            self.request_count[endpoint] = 0
+            self.request_duration[endpoint] = DurationHistogram()
+        
         self.etl_runs: int = 0
         self.etl_failures: int = 0
         self.etl_last_run: float = 0
         
+        # Guards counter updates; held only for the in-memory writes
+        self._lock = threading.Lock()
+        self._rendered: Tuple[bytes, float] = (b"", 0.0)
+        
+        # Render buffer reused across scrapes, and encoded label sets per endpoint
+        self._buffer = bytearray()
+        self._labels: Dict[str, bytes] = {}
+        
     def record_request(self, method: str, path: str, duration: float, status_code: int):
         """Record an API request."""
-        endpoint = f"{method} {path}"
-        self.request_count[endpoint] += 1
-        self.request_duration[endpoint].append(duration)
+        endpoint = sys.intern(f"{method} {path}")
+        with self._lock:
+            self.request_count[endpoint] += 1
+            self.request_duration[endpoint].record(duration)
         
     def record_etl_run(self, success: bool = True):
         """Record an ETL run."""
-        self.etl_runs += 1
-        if not success:
-            self.etl_failures += 1
-        self.etl_last_run = time.time()
-        
-    def get_prometheus_metrics(self) -> str:
-        """Export metrics in Prometheus text format."""
-        lines = [
-            "# HELP api_requests_total Total number of API requests",
-            "# TYPE api_requests_total counter",
-        ]
+        with self._lock:
+            self.etl_runs += 1
+            if not success:
+                self.etl_failures += 1
+            self.etl_last_run = time.time()
+        
+    def get_prometheus_metrics(self) -> bytes:
+        """Export metrics in Prometheus text format, reusing renders for RENDER_TTL seconds."""
+        content, expiry = self._rendered
+        now = time.monotonic()
+        if now < expiry:
+            return content
+        
+        with self._lock:
+            content = self._render()
         
+        self._rendered = (content, now + self.RENDER_TTL)
+        return content
+        
+    def _label(self, endpoint: str) -> bytes:
+        """Return the encoded endpoint label, cached on first sight."""
+        label = self._labels.get(endpoint)
+        if label is None:
+            label = self._labels[endpoint] = f'endpoint="{endpoint}"'.encode()
+        return label
+        
+    def _render(self) -> bytes:
+        """Render current metrics in Prometheus text format."""
+        buffer = self._buffer
+        del buffer[:]
+        
+        buffer += _REQUESTS_HEADER
         for endpoint, count in self.request_count.items():
-            lines.append(f'api_requests_total{{endpoint="{endpoint}"}} {count}')
-        
-        lines.extend([
-            "",
-            "# HELP api_request_duration_seconds API request duration",
-            "# TYPE api_request_duration_seconds summary",
-        ])
-        
-        for endpoint, durations in self.request_duration.items():
-            if durations:
-                # Calculate percentiles
-                sorted_durations = sorted(durations)
-                count = len(sorted_durations)
-                p50 = sorted_durations[int(count * 0.5)] if count > 0 else 0
-                p95 = sorted_durations[int(count * 0.95)] if count > 0 else 0
-                p99 = sorted_durations[int(count * 0.99)] if count > 0 else 0
-                total = sum(sorted_durations)
-                
-                lines.append(f'api_request_duration_seconds_count{{endpoint="{endpoint}"}} {count}')
-                lines.append(f'api_request_duration_seconds_sum{{endpoint="{endpoint}"}} {total:.3f}')
-                lines.append(f'api_request_duration_seconds{{endpoint="{endpoint}",quantile="0.5"}} {p50:.3f}')
-                lines.append(f'api_request_duration_seconds{{endpoint="{endpoint}",quantile="0.95"}} {p95:.3f}')
-                lines.append(f'api_request_duration_seconds{{endpoint="{endpoint}",quantile="0.99"}} {p99:.3f}')
-        
-        lines.extend([
-            "",
-            "# HELP etl_runs_total Total number of ETL runs",
-            "# TYPE etl_runs_total counter",
-            f"etl_runs_total {self.etl_runs}",
-            "",
-            "# HELP etl_failures_total Total number of ETL failures",
-            "# TYPE etl_failures_total counter",
-            f"etl_failures_total {self.etl_failures}",
-            "",
-            "# HELP etl_last_run_timestamp Unix timestamp of last ETL run",
-            "# TYPE etl_last_run_timestamp gauge",
-            f"etl_last_run_timestamp {self.etl_last_run}",
-        ])
-        
-        return "\n".join(lines) + "\n"
+            buffer += b"api_requests_total{%b} %d\n" % (self._label(endpoint), count)
+        
+        buffer += _DURATION_HEADER
+        for endpoint, histogram in self.request_duration.items():
+            if histogram.count:
+                label = self._label(endpoint)
+                buffer += (
+                    b"api_request_duration_seconds_count{%b} %d\n"
+                    b"api_request_duration_seconds_sum{%b} %.3f\n"
+                    b'api_request_duration_seconds{%b,quantile="0.5"} %.3f\n'
+                    b'api_request_duration_seconds{%b,quantile="0.95"} %.3f\n'
+                    b'api_request_duration_seconds{%b,quantile="0.99"} %.3f\n'
+                ) % (
+                    label, histogram.count,
+                    label, histogram.total,
+                    label, histogram.quantile(0.5),
+                    label, histogram.quantile(0.95),
+                    label, histogram.quantile(0.99),
+                )
+        
+        buffer += _ETL_TEMPLATE % (
+            self.etl_runs,
+            self.etl_failures,
+            repr(self.etl_last_run).encode(),
+        )
+        
+        return bytes(buffer)
 
 
 # Global metrics collector
-metrics = MetricsCollector()
+metrics = MetricsCollector(KNOWN_ENDPOINTS)
 
 
 async def metrics_middleware(request: Request, call_next):
     """Middleware to track request metrics."""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
+    
+    # Label by route template so /api/v1/twaps/{twap_id} is a single series
+    route = request.scope.get("route")
     metrics.record_request(
         request.method,
-        request.url.path,
+        route.path if route else request.url.path,
         duration,
         response.status_code
     )
@@ -33,6 +33,9 @@ class TWAPsResponse(BaseModel):
     start: datetime = Field(..., description="Start of query time range")
     end: datetime = Field(..., description="End of query time range")
     twaps: List[TWAPData] = Field(default_factory=list, description="List of TWAPs")
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to fetch the next page; null on the last page"
+    )
 
 
 class TWAPRow(BaseModel):
@@ -54,7 +57,10 @@ class TWAPDetailResponse(BaseModel):
     """Response model for GET /api/v1/twaps/{twap_id}."""
 
     twap_id: str = Field(..., description="TWAP identifier")
-    rows: List[TWAPRow] = Field(default_factory=list, description="All rows for this TWAP")
+    rows: List[TWAPRow] = Field(default_factory=list, description="Rows for this TWAP, newest first")
+    next_cursor: Optional[datetime] = Field(
+        None, description="Pass as before_ts to fetch the next page; null on the last page"
+    )
 
 
 class HealthResponse(BaseModel):
@@ -1,10 +1,28 @@
 """Structured logging configuration."""
 
-import json
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+@lru_cache(maxsize=4)
+def _iso_second(second: int) -> str:
+    """Format a whole Unix second as an ISO8601 UTC prefix (cached)."""
+    return datetime.fromtimestamp(second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _fast_iso(ts: float) -> str:
+    """Format a Unix timestamp as ISO8601 UTC with microseconds."""
+    second = int(ts)
+    micros = int((ts - second) * 1_000_000)
+    return f"{_iso_second(second)}.{micros:06d}+00:00"
 
 
 class StructuredFormatter(logging.Formatter):
@@ -13,7 +31,7 @@ class StructuredFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _fast_iso(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,18 +48,52 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
+
+
+class _PassthroughQueueHandler(QueueHandler):
+    """Queue handler that defers all formatting to the listener thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records never leave the process, so they need no pre-formatting
+        return record
+
+
+# Background listener that formats and writes queued records
+_listener: Optional[QueueListener] = None
+
+
+def stop_structured_logging():
+    """Flush queued log records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_structured_logging)
 
 
 def setup_structured_logging(level: str = "INFO", use_json: bool = True):
     """
     Configure structured logging for the application.
     
+    Records are queued by the calling thread and formatted and written
+    to stdout by a background listener, so logging never blocks on I/O.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         use_json: If True, use JSON formatter; if False, use human-readable format
     """
+    # Skip collecting record attributes the formatters never emit
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    global _listener
+    
     # Remove existing handlers
+    stop_structured_logging()
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -60,7 +112,12 @@ def setup_structured_logging(level: str = "INFO", use_json: bool = True):
         )
     
     handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    
+    root_logger.addHandler(_PassthroughQueueHandler(log_queue))
     root_logger.setLevel(getattr(logging, level.upper()))
     
     return root_logger
@@ -1,10 +1,10 @@
 """SQLAlchemy models for the Hyperliquid TWAP database."""
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Index, Integer, Numeric, Text
-from sqlalchemy.dialects.postgresql import TIMESTAMPTZ
+from sqlalchemy import Boolean, Index, Integer, Text, func, text, true
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, JSONB, TIMESTAMPTZ
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -24,21 +24,40 @@ class TWAPStatus(Base):
     ts: Mapped[datetime] = mapped_column(TIMESTAMPTZ, primary_key=True)
     asset: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     side: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    size_requested: Mapped[Optional[float]] = mapped_column(Numeric, nullable=True)
-    size_executed: Mapped[Optional[float]] = mapped_column(Numeric, nullable=True)
-    notional_executed: Mapped[Optional[float]] = mapped_column(Numeric, nullable=True)
+    size_requested: Mapped[Optional[float]] = mapped_column(DOUBLE_PRECISION, nullable=True)
+    size_executed: Mapped[Optional[float]] = mapped_column(DOUBLE_PRECISION, nullable=True)
+    notional_executed: Mapped[Optional[float]] = mapped_column(DOUBLE_PRECISION, nullable=True)
     status: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     duration_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     s3_object_key: Mapped[str] = mapped_column(Text, nullable=False)
-    raw_payload: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    raw_payload: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     inserted_at: Mapped[datetime] = mapped_column(
-        TIMESTAMPTZ, default=lambda: datetime.now(timezone.utc), nullable=False
+        TIMESTAMPTZ, server_default=func.now(), nullable=False
     )
 
     __table_args__ = (
-        Index("twap_status_wallet_ts_idx", "wallet", "ts"),
-        Index("twap_status_twap_id_idx", "twap_id"),
+        Index(
+            "twap_status_wallet_ts_desc_idx",
+            "wallet",
+            text("ts DESC"),
+            postgresql_include=[
+                "twap_id",
+                "asset",
+                "side",
+                "status",
+                "duration_minutes",
+                "size_executed",
+                "notional_executed",
+            ],
+        ),
+        Index("twap_status_twap_id_ts_desc_idx", "twap_id", text("ts DESC")),
         Index("twap_status_asset_idx", "asset"),
+        Index(
+            "twap_status_ts_brin_idx",
+            "ts",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
 
 
@@ -52,5 +71,21 @@ class ETLIngestLog(Base):
     rows_ingested: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     error_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     ingested_at: Mapped[datetime] = mapped_column(
-        TIMESTAMPTZ, default=lambda: datetime.now(timezone.utc), nullable=False
+        TIMESTAMPTZ, server_default=func.now(), nullable=False
+    )
+    # False for objects processed outside a full incremental run
+    in_watermark: Mapped[bool] = mapped_column(Boolean, server_default=true(), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "etl_ingested_at_brin_idx",
+            "ingested_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 16},
+        ),
+        Index(
+            "etl_log_success_recent_idx",
+            text("ingested_at DESC"),
+            postgresql_where=text("error_text IS NULL"),
+        ),
     )
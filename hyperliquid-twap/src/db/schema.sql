@@ -7,9 +7,9 @@ CREATE TABLE IF NOT EXISTS twap_status (
     ts                 TIMESTAMPTZ NOT NULL,
     asset              TEXT,
     side               TEXT,
-    size_requested     NUMERIC,
-    size_executed      NUMERIC,
-    notional_executed  NUMERIC,
+    size_requested     DOUBLE PRECISION,
+    size_executed      DOUBLE PRECISION,
+    notional_executed  DOUBLE PRECISION,
     status             TEXT,
     duration_minutes   INTEGER,
     s3_object_key      TEXT NOT NULL,
@@ -24,14 +24,28 @@ CREATE TABLE IF NOT EXISTS etl_s3_ingest_log (
     last_modified  TIMESTAMPTZ NOT NULL,
     rows_ingested  INTEGER,
     error_text     TEXT,
-    ingested_at    TIMESTAMPTZ DEFAULT now()
+    ingested_at    TIMESTAMPTZ DEFAULT now(),
+    in_watermark   BOOLEAN NOT NULL DEFAULT true
 );
 
--- Index for wallet-based time range queries
-CREATE INDEX IF NOT EXISTS twap_status_wallet_ts_idx ON twap_status (wallet, ts);
+-- Covering index for wallet-based time range queries (newest first)
+CREATE INDEX IF NOT EXISTS twap_status_wallet_ts_desc_idx ON twap_status (wallet, ts DESC)
+    INCLUDE (twap_id, asset, side, status, duration_minutes, size_executed, notional_executed);
 
--- Index for TWAP ID lookups
-CREATE INDEX IF NOT EXISTS twap_status_twap_id_idx ON twap_status (twap_id);
+-- Index for TWAP ID lookups (newest first)
+CREATE INDEX IF NOT EXISTS twap_status_twap_id_ts_desc_idx ON twap_status (twap_id, ts DESC);
 
 -- Optional: Index for asset filtering
 CREATE INDEX IF NOT EXISTS twap_status_asset_idx ON twap_status (asset);
+
+-- BRIN index for time range scans over ingest-ordered rows
+CREATE INDEX IF NOT EXISTS twap_status_ts_brin_idx ON twap_status
+    USING BRIN (ts) WITH (pages_per_range = 32);
+
+-- BRIN index for ingest log time scans
+CREATE INDEX IF NOT EXISTS etl_ingested_at_brin_idx ON etl_s3_ingest_log
+    USING BRIN (ingested_at) WITH (pages_per_range = 16);
+
+-- Partial index for the latest successful ingest (health check)
+CREATE INDEX IF NOT EXISTS etl_log_success_recent_idx ON etl_s3_ingest_log (ingested_at DESC)
+    WHERE error_text IS NULL;
@@ -17,8 +17,21 @@ class ETLConfig:
     
     DATABASE_URL = os.getenv("DATABASE_URL")
     
-    # Batch size for database inserts
-    BATCH_SIZE = int(os.getenv("ETL_BATCH_SIZE", "1000"))
+    # Number of S3 objects loaded per database commit
+    FLUSH_EVERY = int(os.getenv("ETL_FLUSH_EVERY", "100"))
+    
+    # Store every parquet column in raw_payload; when off only mapped columns are read
+    STORE_RAW_PAYLOAD = os.getenv("STORE_RAW_PAYLOAD", "true").lower() in ("1", "true", "yes")
+    
+    # Rows per Arrow table when local parquet files are parsed in batches
+    PARSE_BATCH_SIZE = int(os.getenv("ETL_PARSE_BATCH_SIZE", "65536"))
+    
+    # Concurrent S3 downloads prefetched ahead of parsing and loading
+    DOWNLOAD_WORKERS = int(os.getenv("ETL_DOWNLOAD_WORKERS", "8"))
+    
+    # Objects larger than one chunk are fetched as concurrent byte-range GETs
+    DOWNLOAD_CHUNK_SIZE = int(os.getenv("ETL_DOWNLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    RANGE_WORKERS = int(os.getenv("ETL_RANGE_WORKERS", "8"))
     
     @classmethod
     def validate(cls):
@@ -1,38 +1,312 @@
 """Database loader for TWAP data."""
 
+import io
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Union
 
-from sqlalchemy import create_engine, text
+import orjson
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 
 from ..db.models import ETLIngestLog, TWAPStatus
 from .config import ETLConfig
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 logger = logging.getLogger(__name__)
 
+# twap_status columns supplied by the parser, in COPY order
+COPY_COLUMNS = (
+    "twap_id",
+    "wallet",
+    "ts",
+    "asset",
+    "side",
+    "size_requested",
+    "size_executed",
+    "notional_executed",
+    "status",
+    "duration_minutes",
+    "s3_object_key",
+    "raw_payload",
+)
+_COLUMN_LIST = ", ".join(COPY_COLUMNS)
+
+# Constraint-free staging table, kept for the session and emptied per load.
+# duration_minutes is NUMERIC so float-typed minutes are cast on merge.
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS twap_status_staging (
+    twap_id            TEXT,
+    wallet             TEXT,
+    ts                 TIMESTAMPTZ,
+    asset              TEXT,
+    side               TEXT,
+    size_requested     DOUBLE PRECISION,
+    size_executed      DOUBLE PRECISION,
+    notional_executed  DOUBLE PRECISION,
+    status             TEXT,
+    duration_minutes   NUMERIC,
+    s3_object_key      TEXT,
+    raw_payload        JSONB
+) ON COMMIT DELETE ROWS
+"""
+TRUNCATE_STAGING_SQL = "TRUNCATE twap_status_staging"
+
+# Upsert of ingest log entries, executed with one parameter set per object;
+# ingested_at comes from the server default on insert and now() on update.
+# Keys are not split into plain INSERTs for first-seen objects: retried
+# objects already have a failed entry, a concurrent run may insert the same
+# key, and one conflicting row would roll back the whole batch's loads.
+# Without a conflict, ON CONFLICT costs no more than the unique check a
+# plain INSERT makes anyway.
+_ingest_log_insert = insert(ETLIngestLog.__table__)
+UPSERT_INGEST_LOG = _ingest_log_insert.on_conflict_do_update(
+    index_elements=["s3_object_key"],
+    set_={
+        **{
+            column: _ingest_log_insert.excluded[column]
+            for column in ("last_modified", "rows_ingested", "error_text", "in_watermark")
+        },
+        "ingested_at": func.now(),
+    },
+)
+
+# Objects modified before the newest success are done, unless an older one failed.
+# Only successes from runs that listed everything since the previous watermark
+# count: a single object processed on its own says nothing about older ones.
+WATERMARK_SQL = text("""
+SELECT LEAST(
+    max(last_modified) FILTER (WHERE error_text IS NULL AND in_watermark),
+    min(last_modified) FILTER (WHERE error_text IS NOT NULL)
+)
+FROM etl_s3_ingest_log
+""")
+
+# Keys of all successfully ingested objects
+PROCESSED_OBJECTS_SQL = text(
+    "SELECT s3_object_key FROM etl_s3_ingest_log WHERE error_text IS NULL"
+)
+PROCESSED_OBJECTS_BATCH = 10000
+
+# Candidate keys without a successful ingest log entry, checked in batches
+# so a large listing never becomes one oversized array parameter
+UNPROCESSED_KEYS_BATCH = 10000
+UNPROCESSED_KEYS_SQL = text("""
+SELECT candidate.key
+FROM unnest(CAST(:keys AS text[])) AS candidate(key)
+WHERE NOT EXISTS (
+    SELECT 1 FROM etl_s3_ingest_log log
+    WHERE log.s3_object_key = candidate.key AND log.error_text IS NULL
+)
+""")
+
+# Secondary twap_status indexes dropped for bulk loads and rebuilt afterwards;
+# the primary key stays because the merge relies on it for ON CONFLICT
+BULK_INDEXES = sorted(TWAPStatus.__table__.indexes, key=lambda index: index.name)
+DROP_BULK_INDEX_SQL = [
+    f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}" for index in BULK_INDEXES
+]
+CREATE_BULK_INDEX_SQL = [
+    str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+    for index in BULK_INDEXES
+]
+
+COPY_STAGING_SQL = f"COPY twap_status_staging ({_COLUMN_LIST}) FROM STDIN"
+MERGE_STAGING_SQL = (
+    f"INSERT INTO twap_status ({_COLUMN_LIST}) "
+    f"SELECT {_COLUMN_LIST} FROM twap_status_staging "
+    f"ON CONFLICT (twap_id, wallet, ts) DO NOTHING"
+)
+
+
+_COPY_NULL = "\\N"
+
+# Types whose str() never contains a COPY delimiter or escape character
+_PLAIN_COPY_TYPES = {int, float, datetime}
+_COPY_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"))
+_COPY_SPECIAL_CHARS = tuple(char for char, _ in _COPY_ESCAPES)
+_COPY_SPECIAL_PATTERN = "[\\\\\t\n\r]"
+
+
+def _copy_field(value: Any) -> str:
+    """Encode a value as a field of PostgreSQL's COPY text format."""
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, dict):
+        value = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_column(values: List[Any]) -> List[str]:
+    """
+    Encode one column's values as COPY text-format fields.
+    
+    Columns of numbers and timestamps, and text columns without special
+    characters, skip per-value escaping.
+    """
+    types = set(map(type, values))
+    types.discard(type(None))
+    
+    if types <= _PLAIN_COPY_TYPES:
+        return [_COPY_NULL if value is None else str(value) for value in values]
+    
+    if types == {dict}:
+        values = [
+            None if value is None
+            else orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            for value in values
+        ]
+        types = {str}
+    
+    if types == {str}:
+        text = "".join([value for value in values if value is not None])
+        if not any(char in text for char in _COPY_SPECIAL_CHARS):
+            return [_COPY_NULL if value is None else value for value in values]
+    
+    return [_copy_field(value) for value in values]
+
+
+def _copy_buffer(records: List[Dict[str, Any]]) -> io.StringIO:
+    """Serialize records into a COPY text-format buffer, one column at a time."""
+    columns = [
+        _copy_column([record.get(column) for record in records])
+        for column in COPY_COLUMNS
+    ]
+    lines = map("\t".join, zip(*columns, strict=True))
+    return io.StringIO("".join([line + "\n" for line in lines]))
+
+
+def _is_plain_arrow_type(arrow_type: "pa.DataType") -> bool:
+    """Whether an Arrow type casts to text without COPY special characters."""
+    import pyarrow as pa
+    
+    return (
+        pa.types.is_integer(arrow_type)
+        or pa.types.is_floating(arrow_type)
+        or pa.types.is_decimal(arrow_type)
+        or pa.types.is_boolean(arrow_type)
+        or pa.types.is_temporal(arrow_type)
+        or pa.types.is_null(arrow_type)
+    )
+
+
+def _copy_table_buffer(table: Union["pa.Table", "pa.RecordBatch"]) -> io.BytesIO:
+    """Serialize an Arrow table or record batch into a COPY text-format buffer with compute kernels."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    fields = []
+    for column in COPY_COLUMNS:
+        values = table.column(column)
+        try:
+            text = values.cast(pa.string())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # Nested or binary values fall back to the per-value encoder
+            fields.append(pa.array(_copy_column(values.to_pylist()), pa.string()))
+            continue
+        
+        # Numbers and timestamps never need escaping; text only if it has specials
+        if not _is_plain_arrow_type(values.type) and pc.any(
+            pc.match_substring_regex(text, _COPY_SPECIAL_PATTERN)
+        ).as_py():
+            for char, escaped in _COPY_ESCAPES:
+                text = pc.replace_substring(text, char, escaped)
+        fields.append(pc.fill_null(text, _COPY_NULL))
+    
+    lines = pc.binary_join_element_wise(*fields, "\t")
+    lines = pc.binary_join_element_wise(lines, "", "\n")
+    if isinstance(lines, pa.ChunkedArray):
+        lines = lines.combine_chunks()
+    
+    # Every field is non-null, so the lines are contiguous in the data buffer
+    _, offsets_buffer, data = lines.buffers()
+    offsets = pa.Array.from_buffers(
+        pa.int32(), len(lines) + 1, [None, offsets_buffer], offset=lines.offset
+    )
+    start = offsets[0].as_py()
+    return io.BytesIO(data.slice(start, offsets[-1].as_py() - start))
+
+
+def _copy_records(records: List[Dict[str, Any]]) -> List[tuple]:
+    """Convert records into tuples in COPY_COLUMNS order for asyncpg's binary COPY."""
+    rows = []
+    for record in records:
+        row = [record.get(column) for column in COPY_COLUMNS]
+        # asyncpg sends jsonb as text
+        if isinstance(row[-1], dict):
+            row[-1] = orjson.dumps(row[-1], option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        rows.append(tuple(row))
+    return rows
+
 
 class TWAPLoader:
     """Loader for inserting TWAP data into PostgreSQL."""
 
-    def __init__(self):
-        """Initialize database connection."""
+    def __init__(self, flush_every: int = 1):
+        """
+        Initialize database connection.
+        
+        Args:
+            flush_every: Number of processed objects to accumulate per commit;
+                above 1, each object's rows and ingest log entry are written
+                in the same transaction, so they are never committed apart
+        """
         # Convert async URL to sync for SQLAlchemy Core operations
         db_url = ETLConfig.DATABASE_URL
         if "asyncpg" in db_url:
             db_url = db_url.replace("postgresql+asyncpg://", "postgresql://")
         
-        self.engine = create_engine(db_url)
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine = create_engine(
+            db_url,
+            pool_size=4,
+            max_overflow=8,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+            connect_args={
+                "keepalives": 1,
+                "keepalives_idle": 30,
+                # Ingest log entries commit with their rows, so a commit lost
+                # on crash only means those objects are reprocessed
+                "options": "-c synchronous_commit=off",
+            },
+        )
+        self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        
+        # One long-lived session; work is committed every flush_every objects
+        self.session = self.Session()
+        self.flush_every = max(flush_every, 1)
+        
+        # Ingest log entries written in one statement at the next flush
+        self._pending_log: Dict[str, Dict[str, Any]] = {}
 
-    def load_records(self, records: List[Dict[str, Any]], s3_object_key: str) -> int:
+    def load_records(
+        self, records: Union[List[Dict[str, Any]], "pa.Table"], s3_object_key: str
+    ) -> int:
         """
         Load records into the database with ON CONFLICT DO NOTHING.
         
+        Records are streamed with COPY into a temporary staging table and
+        then merged into twap_status in a single INSERT ... SELECT. When
+        flushing every object the load is committed immediately; otherwise
+        it is committed together with the object's ingest log entry.
+        
         Args:
-            records: List of record dictionaries
+            records: Record dictionaries, or an Arrow table from parse_parquet_table
             s3_object_key: S3 object key being processed
             
         Returns:
@@ -42,111 +316,341 @@ class TWAPLoader:
             logger.warning("No records to load")
             return 0
         
-        session = self.Session()
-        rows_inserted = 0
+        if isinstance(records, list):
+            buffer = _copy_buffer(records)
+        else:
+            buffer = _copy_table_buffer(records)
         
+        return self._load_buffers([buffer])
+
+    def load_batches(self, batches: Iterable["pa.Table"], s3_object_key: str) -> int:
+        """
+        Load one object's Arrow tables, e.g. from iter_parquet_file_tables.
+        
+        Each table is encoded and copied into the staging table as it
+        arrives, so only one batch is held in memory; the merge into
+        twap_status still runs once for the whole object.
+        
+        Args:
+            batches: Arrow tables of twap_status columns
+            s3_object_key: S3 object key being processed
+            
+        Returns:
+            Number of rows inserted
+        """
+        return self._load_buffers(
+            _copy_table_buffer(batch) for batch in batches if batch.num_rows
+        )
+
+    def _load_buffers(self, buffers: Iterable[Union[io.StringIO, io.BytesIO]]) -> int:
+        """
+        COPY encoded buffers into the staging table and merge them.
+        
+        Args:
+            buffers: COPY text format buffers, consumed one at a time
+            
+        Returns:
+            Number of rows inserted
+        """
         try:
-            # Insert records in batches
-            batch_size = ETLConfig.BATCH_SIZE
+            # A savepoint keeps a failed load from discarding earlier pending work
+            with self.session.begin_nested():
+                cursor = self.session.connection().connection.cursor()
+                cursor.execute(CREATE_STAGING_SQL)
+                cursor.execute(TRUNCATE_STAGING_SQL)
+                rows_copied = 0
+                for buffer in buffers:
+                    cursor.copy_expert(COPY_STAGING_SQL, buffer)
+                    rows_copied += cursor.rowcount
+                cursor.execute(MERGE_STAGING_SQL)
+                rows_inserted = cursor.rowcount
             
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                
-                # Use INSERT ... ON CONFLICT DO NOTHING
-                stmt = insert(TWAPStatus.__table__).values(batch)
-                stmt = stmt.on_conflict_do_nothing(
-                    index_elements=["twap_id", "wallet", "ts"]
-                )
-                
-                result = session.execute(stmt)
-                rows_inserted += result.rowcount
-                
-                logger.info(
-                    f"Inserted batch {i // batch_size + 1}: "
-                    f"{result.rowcount} rows (total: {rows_inserted})"
-                )
+            if self.flush_every == 1:
+                self.flush()
             
-            session.commit()
-            logger.info(f"Successfully loaded {rows_inserted} records")
+            logger.info(
+                f"Successfully loaded {rows_inserted} records "
+                f"({rows_copied - rows_inserted} already present)"
+            )
             
             return rows_inserted
             
         except Exception as e:
-            session.rollback()
             logger.error(f"Error loading records: {e}")
             raise
-        finally:
-            session.close()
 
     def mark_object_processed(
         self,
         s3_object_key: str,
         last_modified: datetime,
         rows_ingested: int,
-        error_text: str = None
+        error_text: str = None,
+        in_watermark: bool = True
     ):
         """
         Mark an S3 object as processed in the ingest log.
         
+        Entries are buffered and written, together with any pending loads,
+        once flush_every objects have been marked.
+        
         Args:
             s3_object_key: S3 object key
             last_modified: Object's last modified timestamp
             rows_ingested: Number of rows ingested
             error_text: Optional error message if processing failed
+            in_watermark: Whether a success may advance the ingest watermark;
+                false when older objects were not listed, e.g. --object-key
         """
-        session = self.Session()
+        # Keyed by object so a batch never upserts the same row twice
+        self._pending_log[s3_object_key] = {
+            "s3_object_key": s3_object_key,
+            "last_modified": last_modified,
+            "rows_ingested": rows_ingested,
+            "error_text": error_text,
+            "in_watermark": in_watermark,
+        }
         
+        if len(self._pending_log) >= self.flush_every:
+            self.flush()
+        
+        logger.info(f"Marked {s3_object_key} as processed")
+
+    def flush(self):
+        """
+        Write pending ingest log entries and commit all pending work.
+        
+        A failed commit rolls back the loads of every pending object, so
+        their entries are rewritten as failed and committed on their own;
+        the watermark then stays behind them and they are retried. Entries
+        that cannot be written stay pending for the next flush. The commit
+        error is re-raised either way.
+        """
         try:
-            stmt = insert(ETLIngestLog.__table__).values(
-                s3_object_key=s3_object_key,
-                last_modified=last_modified,
-                rows_ingested=rows_ingested,
-                error_text=error_text
-            )
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["s3_object_key"],
-                set_={
-                    "last_modified": last_modified,
-                    "rows_ingested": rows_ingested,
-                    "error_text": error_text,
-                    "ingested_at": datetime.now(timezone.utc)
-                }
-            )
-            
-            session.execute(stmt)
-            session.commit()
-            
-            logger.info(f"Marked {s3_object_key} as processed")
+            if self._pending_log:
+                self.session.execute(UPSERT_INGEST_LOG, list(self._pending_log.values()))
+            self.session.commit()
             
         except Exception as e:
-            session.rollback()
-            logger.error(f"Error marking object as processed: {e}")
+            self.session.rollback()
+            logger.error(f"Error committing processed objects: {e}")
+            self._mark_pending_failed(e)
             raise
+        
+        self._pending_log.clear()
+
+    def _mark_pending_failed(self, error: Exception):
+        """Record pending objects as failed after their batch was rolled back."""
+        if not self._pending_log:
+            return
+        
+        for entry in self._pending_log.values():
+            entry["rows_ingested"] = 0
+            entry["error_text"] = f"Commit error: {error}"
+        
+        try:
+            self.session.execute(UPSERT_INGEST_LOG, list(self._pending_log.values()))
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error marking {len(self._pending_log)} rolled back objects as failed: {e}")
+            return
+        
+        logger.warning(f"Marked {len(self._pending_log)} rolled back objects as failed for retry")
+        self._pending_log.clear()
+
+    def begin_bulk(self):
+        """
+        Drop secondary twap_status indexes ahead of a large backfill.
+        
+        Each index is then built once from the loaded table by end_bulk
+        instead of being maintained row by row during the load.
+        """
+        self.flush()
+        self._execute_autocommit(DROP_BULK_INDEX_SQL)
+        logger.info(f"Dropped {len(DROP_BULK_INDEX_SQL)} indexes for bulk load")
+
+    def end_bulk(self):
+        """Commit pending work and rebuild the indexes dropped by begin_bulk."""
+        self.flush()
+        self._execute_autocommit(CREATE_BULK_INDEX_SQL)
+        logger.info(f"Rebuilt {len(CREATE_BULK_INDEX_SQL)} indexes after bulk load")
+
+    def _execute_autocommit(self, statements: List[str]):
+        """Run DDL statements outside a transaction block."""
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in statements:
+                conn.exec_driver_sql(statement)
+
+    def get_last_ingested_watermark(self) -> Optional[datetime]:
+        """
+        Get the last_modified time from which S3 objects may still need processing.
+        
+        This is the newest timestamp among objects ingested successfully by
+        runs that listed from the previous watermark, or the oldest failed
+        object's timestamp if that is earlier, so failures are retried.
+        
+        Returns:
+            Watermark datetime, or None if nothing has been ingested yet
+        """
+        return self.session.execute(WATERMARK_SQL).scalar()
+
+    def get_unprocessed_keys(self, keys: List[str]) -> Set[str]:
+        """
+        Filter S3 object keys down to those not yet successfully processed.
+        
+        The anti-join runs in Postgres, so only candidate keys are held in
+        memory rather than every processed key.
+        
+        Args:
+            keys: Candidate S3 object keys
+            
+        Returns:
+            Set of keys without a successful ingest log entry
+        """
+        unprocessed = set()
+        for start in range(0, len(keys), UNPROCESSED_KEYS_BATCH):
+            batch = keys[start:start + UNPROCESSED_KEYS_BATCH]
+            result = self.session.execute(UNPROCESSED_KEYS_SQL, {"keys": batch})
+            unprocessed.update(row[0] for row in result)
+        return unprocessed
+
+    def get_processed_objects(self) -> Iterator[str]:
+        """
+        Iterate over already processed S3 object keys.
+        
+        Keys are streamed from a server-side cursor in batches of
+        PROCESSED_OBJECTS_BATCH, so memory stays bounded however large the
+        ingest log grows. Membership checks against a listing should use
+        get_unprocessed_keys, which filters in Postgres instead.
+        
+        Yields:
+            S3 object keys
+        """
+        result = self.session.execute(
+            PROCESSED_OBJECTS_SQL,
+            execution_options={"yield_per": PROCESSED_OBJECTS_BATCH},
+        )
+        
+        for row in result:
+            yield row[0]
+
+    def close(self):
+        """Commit pending work and close the database connection."""
+        try:
+            self.flush()
         finally:
-            session.close()
+            self.session.close()
+            self.engine.dispose()
+
+
+class AsyncTWAPLoader:
+    """
+    Loader for inserting TWAP data through a SQLAlchemy async engine.
+    
+    For asyncio callers that already hold an asyncpg pool, such as the API
+    or its tests: loads run on the event loop through that pool instead of
+    blocking it on a separate psycopg2 connection.
+    """
 
-    def get_processed_objects(self) -> set:
+    def __init__(self, bind: Union[AsyncEngine, AsyncConnection], **session_options):
         """
-        Get set of already processed S3 object keys.
+        Initialize the session factory.
+        
+        Args:
+            bind: Async engine, or connection, to load through
+            **session_options: Extra async_sessionmaker options, e.g.
+                join_transaction_mode for a connection in a transaction
+        """
+        self.Session = async_sessionmaker(bind, expire_on_commit=False, **session_options)
+
+    async def load_records(
+        self, records: Union[List[Dict[str, Any]], "pa.Table"], s3_object_key: str
+    ) -> int:
+        """
+        Load records into the database with ON CONFLICT DO NOTHING.
         
+        Record dictionaries are sent with asyncpg's binary COPY. Arrow
+        tables are encoded to COPY text one record batch at a time with
+        compute kernels, as in TWAPLoader, so no Python object is built
+        per row. Either way the staging table is merged into twap_status
+        in one transaction.
+        
+        Args:
+            records: Record dictionaries, or an Arrow table from parse_parquet_table
+            s3_object_key: S3 object key being processed
+            
         Returns:
-            Set of S3 object keys
+            Number of rows inserted
         """
-        session = self.Session()
+        if not records:
+            logger.warning("No records to load")
+            return 0
         
         try:
-            result = session.execute(
-                text("SELECT s3_object_key FROM etl_s3_ingest_log WHERE error_text IS NULL")
-            )
+            async with self.Session() as session, session.begin():
+                conn = await session.connection()
+                await conn.exec_driver_sql(CREATE_STAGING_SQL)
+                await conn.exec_driver_sql(TRUNCATE_STAGING_SQL)
+                
+                driver_connection = (await conn.get_raw_connection()).driver_connection
+                if isinstance(records, list):
+                    await driver_connection.copy_records_to_table(
+                        "twap_status_staging",
+                        records=_copy_records(records),
+                        columns=COPY_COLUMNS,
+                    )
+                else:
+                    for batch in records.to_batches():
+                        await driver_connection.copy_to_table(
+                            "twap_status_staging",
+                            source=_copy_table_buffer(batch).getbuffer(),
+                            columns=COPY_COLUMNS,
+                        )
+                
+                result = await conn.exec_driver_sql(MERGE_STAGING_SQL)
+                rows_inserted = result.rowcount
             
-            processed = {row[0] for row in result}
-            logger.info(f"Found {len(processed)} already processed objects")
+            logger.info(
+                f"Successfully loaded {rows_inserted} records "
+                f"({len(records) - rows_inserted} already present)"
+            )
             
-            return processed
+            return rows_inserted
             
-        finally:
-            session.close()
+        except Exception as e:
+            logger.error(f"Error loading records: {e}")
+            raise
 
-    def close(self):
-        """Close database connection."""
-        self.engine.dispose()
+    async def mark_object_processed(
+        self,
+        s3_object_key: str,
+        last_modified: datetime,
+        rows_ingested: int,
+        error_text: str = None,
+        in_watermark: bool = True
+    ):
+        """
+        Mark an S3 object as processed in the ingest log.
+        
+        Args:
+            s3_object_key: S3 object key
+            last_modified: Object's last modified timestamp
+            rows_ingested: Number of rows ingested
+            error_text: Optional error message if processing failed
+            in_watermark: Whether a success may advance the ingest watermark;
+                false when older objects were not listed, e.g. --object-key
+        """
+        async with self.Session() as session, session.begin():
+            await session.execute(
+                UPSERT_INGEST_LOG,
+                [{
+                    "s3_object_key": s3_object_key,
+                    "last_modified": last_modified,
+                    "rows_ingested": rows_ingested,
+                    "error_text": error_text,
+                    "in_watermark": in_watermark,
+                }],
+            )
+        
+        logger.info(f"Marked {s3_object_key} as processed")
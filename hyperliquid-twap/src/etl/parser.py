@@ -1,12 +1,15 @@
 """Parquet file parser for TWAP data."""
 
-import io
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
-import pandas as pd
-import pyarrow.parquet as pq
+from .config import ETLConfig
+
+# pyarrow is imported on first parse to keep CLI startup fast
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
 
@@ -40,128 +43,406 @@ class TWAPParser:
         Returns:
             List of record dictionaries
         """
+        import pyarrow as pa
+        
         try:
-            # Read parquet from bytes
-            buffer = io.BytesIO(content)
-            table = pq.read_table(buffer)
-            df = table.to_pandas()
-            
-            logger.info(f"Parsed {len(df)} rows from parquet")
+            # Read parquet from bytes; BufferReader reads in C++ without copying,
+            # and pre-buffering coalesces column chunk reads
+            table = TWAPParser._read_table(pa.BufferReader(content), pre_buffer=True)
             
-            # Convert to records
-            records = []
-            for _, row in df.iterrows():
-                record = TWAPParser._row_to_record(row, s3_object_key)
-                records.append(record)
+            logger.info(f"Parsed {table.num_rows} rows from parquet")
             
-            return records
+            return TWAPParser._table_to_records(table, s3_object_key)
             
         except Exception as e:
             logger.error(f"Error parsing parquet: {e}")
             raise
 
     @staticmethod
-    def parse_parquet_file(filepath: str, s3_object_key: str = "local") -> List[Dict[str, Any]]:
+    def parse_parquet_file(
+        filepath: str, s3_object_key: str = "local", columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Parse parquet file from local filesystem.
         
         Args:
             filepath: Path to parquet file
             s3_object_key: S3 key for tracking (default: 'local')
+            columns: Optional database columns to populate; only their parquet
+                columns are read and the rest are None
             
         Returns:
             List of record dictionaries
         """
         try:
-            df = pd.read_parquet(filepath)
-            logger.info(f"Parsed {len(df)} rows from {filepath}")
+            # Memory-map the file so the page cache serves column chunk reads
+            table = TWAPParser._read_table(filepath, columns, memory_map=True)
+            logger.info(f"Parsed {table.num_rows} rows from {filepath}")
             
-            records = []
-            for _, row in df.iterrows():
-                record = TWAPParser._row_to_record(row, s3_object_key)
-                records.append(record)
+            return TWAPParser._table_to_records(
+                table, s3_object_key, TWAPParser._stores_raw_payload(columns)
+            )
             
-            return records
+        except Exception as e:
+            logger.error(f"Error parsing parquet file {filepath}: {e}")
+            raise
+
+    @staticmethod
+    def parse_parquet_table(content: bytes, s3_object_key: str) -> "pa.Table":
+        """
+        Parse parquet content into an Arrow table of database columns.
+        
+        Unlike parse_parquet no per-row dictionaries are built, so the
+        loader can encode the table column by column.
+        
+        Args:
+            content: Parquet file content as bytes
+            s3_object_key: S3 key for tracking
+            
+        Returns:
+            Arrow table with one column per twap_status column
+        """
+        import pyarrow as pa
+        
+        try:
+            table = TWAPParser._read_table(pa.BufferReader(content), pre_buffer=True)
+            
+            logger.info(f"Parsed {table.num_rows} rows from parquet")
+            
+            return TWAPParser._table_to_columns(table, s3_object_key)
+            
+        except Exception as e:
+            logger.error(f"Error parsing parquet: {e}")
+            raise
+
+    @staticmethod
+    def parse_parquet_file_table(
+        filepath: str, s3_object_key: str = "local", columns: Optional[List[str]] = None
+    ) -> "pa.Table":
+        """
+        Parse parquet file from local filesystem into an Arrow table.
+        
+        Args:
+            filepath: Path to parquet file
+            s3_object_key: S3 key for tracking (default: 'local')
+            columns: Optional database columns to populate; only their parquet
+                columns are read and the rest are null
+            
+        Returns:
+            Arrow table with one column per twap_status column
+        """
+        try:
+            table = TWAPParser._read_table(filepath, columns, memory_map=True)
+            logger.info(f"Parsed {table.num_rows} rows from {filepath}")
+            
+            return TWAPParser._table_to_columns(
+                table, s3_object_key, TWAPParser._stores_raw_payload(columns)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error parsing parquet file {filepath}: {e}")
+            raise
+
+    @staticmethod
+    def iter_parquet_file_tables(
+        filepath: str, s3_object_key: str = "local", batch_size: Optional[int] = None
+    ) -> Iterator["pa.Table"]:
+        """
+        Parse a local parquet file into Arrow tables of at most batch_size rows.
+        
+        Batches are read and converted one at a time, so memory is bounded
+        by the batch size rather than the file size.
+        
+        Args:
+            filepath: Path to parquet file
+            s3_object_key: S3 key for tracking (default: 'local')
+            batch_size: Rows per table (defaults to ETLConfig.PARSE_BATCH_SIZE)
+            
+        Yields:
+            Arrow tables with one column per twap_status column
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        try:
+            parquet_file = pq.ParquetFile(filepath, memory_map=True)
+            batches = parquet_file.iter_batches(
+                batch_size=batch_size or ETLConfig.PARSE_BATCH_SIZE,
+                columns=TWAPParser._projected_columns(parquet_file),
+                use_threads=True,
+            )
+            
+            num_rows = 0
+            for batch in batches:
+                num_rows += batch.num_rows
+                yield TWAPParser._table_to_columns(pa.Table.from_batches([batch]), s3_object_key)
+            
+            logger.info(f"Parsed {num_rows} rows from {filepath}")
             
         except Exception as e:
             logger.error(f"Error parsing parquet file {filepath}: {e}")
             raise
 
     @staticmethod
-    def _row_to_record(row: pd.Series, s3_object_key: str) -> Dict[str, Any]:
+    def _read_table(
+        source: Any, columns: Optional[List[str]] = None, **options: Any
+    ) -> "pa.Table":
+        """
+        Read a parquet source into an Arrow table.
+        
+        Unless raw payloads are stored, only the mapped columns are read.
+        Row groups are not pruned by state_timestamp statistics: the ingest
+        watermark tracks object modification times, and a newly written
+        object can still carry status rows with older timestamps.
+        
+        Args:
+            source: File path or Arrow buffer reader
+            columns: Optional database columns to read (see _projected_columns)
+            **options: Extra pyarrow.parquet.ParquetFile options
+            
+        Returns:
+            Arrow table
+        """
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(source, **options)
+        
+        return parquet_file.read(
+            columns=TWAPParser._projected_columns(parquet_file, columns), use_threads=True
+        )
+
+    @staticmethod
+    def _projected_columns(
+        parquet_file: "pq.ParquetFile", columns: Optional[List[str]] = None
+    ) -> Optional[List[str]]:
         """
-        Convert a pandas row to a database record.
+        Select the parquet columns to read.
         
         Args:
-            row: Pandas series representing a row
+            parquet_file: Opened parquet file
+            columns: Optional database columns to populate (default: all)
+            
+        Returns:
+            Parquet columns present in the file, or None for every column
+            when raw payloads are stored
+        """
+        if TWAPParser._stores_raw_payload(columns):
+            return None
+        
+        available = set(parquet_file.schema_arrow.names)
+        return [
+            col for col, db_col in TWAPParser.COLUMN_MAPPING.items()
+            if col in available and (columns is None or db_col in columns)
+        ]
+
+    @staticmethod
+    def _stores_raw_payload(columns: Optional[List[str]] = None) -> bool:
+        """Whether raw_payload is built, which needs every parquet column read."""
+        if columns is None:
+            return ETLConfig.STORE_RAW_PAYLOAD
+        return "raw_payload" in columns
+
+    @staticmethod
+    def _table_to_records(
+        table: "pa.Table", s3_object_key: str, store_raw: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert a parquet Arrow table to database records column-wise.
+        
+        Args:
+            table: Arrow table read from a parquet file
             s3_object_key: S3 key for tracking
+            store_raw: Build raw_payload (defaults to ETLConfig.STORE_RAW_PAYLOAD)
             
         Returns:
-            Dictionary ready for database insertion
-        """
-        record = {}
-        
-        # Map columns according to schema
-        for parquet_col, db_col in TWAPParser.COLUMN_MAPPING.items():
-            if parquet_col in row.index:
-                value = row[parquet_col]
-                
-                # Handle timestamp conversion
-                if db_col == "ts":
-                    value = TWAPParser._normalize_timestamp(value)
-                
-                # Handle pandas NA/NaN values
-                if pd.isna(value):
-                    value = None
-                
-                record[db_col] = value
-            else:
-                # Column not present in parquet, set to None
-                record[db_col] = None
+            List of dictionaries ready for database insertion
+        """
+        table = TWAPParser._prepare_table(table)
+        
+        # Convert each column to Python objects once
+        values = {
+            name: TWAPParser._column_values(table.column(name))
+            for name in table.column_names
+        }
+        
+        # Map columns according to schema; columns missing from the parquet are None
+        missing = [None] * table.num_rows
+        columns = {
+            db_col: values.get(parquet_col, missing)
+            for parquet_col, db_col in TWAPParser.COLUMN_MAPPING.items()
+        }
+        if "state_timestamp" in values:
+            columns["ts"] = TWAPParser._column_values(
+                TWAPParser._normalize_timestamps(table.column("state_timestamp"))
+            )
         
         # Add metadata
-        record["s3_object_key"] = s3_object_key
+        columns["s3_object_key"] = repeat(s3_object_key, table.num_rows)
         
         # Store entire row as JSON for forward compatibility
-        raw_payload = row.to_dict()
-        # Convert timestamps and NaN values for JSON serialization
-        for key, value in raw_payload.items():
-            if pd.isna(value):
-                raw_payload[key] = None
-            elif isinstance(value, pd.Timestamp):
-                raw_payload[key] = value.isoformat()
+        if store_raw is None:
+            store_raw = ETLConfig.STORE_RAW_PAYLOAD
+        if store_raw:
+            columns["raw_payload"] = [
+                dict(zip(values, row, strict=True))
+                for row in zip(*values.values(), strict=True)
+            ]
+        else:
+            columns["raw_payload"] = repeat(None, table.num_rows)
         
-        record["raw_payload"] = raw_payload
+        names = list(columns)
+        return [dict(zip(names, row, strict=True)) for row in zip(*columns.values(), strict=True)]
+
+    @staticmethod
+    def _table_to_columns(
+        table: "pa.Table", s3_object_key: str, store_raw: Optional[bool] = None
+    ) -> "pa.Table":
+        """
+        Convert a parquet Arrow table to database columns.
+        
+        Mapped columns keep their Arrow types; only raw_payload, when
+        stored, is serialized row by row to JSON text.
+        
+        Args:
+            table: Arrow table read from a parquet file
+            s3_object_key: S3 key for tracking
+            store_raw: Build raw_payload (defaults to ETLConfig.STORE_RAW_PAYLOAD)
+            
+        Returns:
+            Arrow table with one column per twap_status column
+        """
+        import orjson
+        import pyarrow as pa
+        
+        table = TWAPParser._prepare_table(table)
+        num_rows = table.num_rows
+        available = set(table.column_names)
+        
+        # Map columns according to schema; columns missing from the parquet are null
+        columns = {
+            db_col: table.column(parquet_col) if parquet_col in available else pa.nulls(num_rows)
+            for parquet_col, db_col in TWAPParser.COLUMN_MAPPING.items()
+        }
+        if "state_timestamp" in available:
+            columns["ts"] = TWAPParser._normalize_timestamps(table.column("state_timestamp"))
         
-        return record
+        # Add metadata
+        columns["s3_object_key"] = pa.repeat(s3_object_key, num_rows)
+        
+        # Store entire row as JSON for forward compatibility
+        if store_raw is None:
+            store_raw = ETLConfig.STORE_RAW_PAYLOAD
+        if store_raw:
+            values = {
+                name: TWAPParser._column_values(table.column(name))
+                for name in table.column_names
+            }
+            payloads = [
+                orjson.dumps(
+                    dict(zip(values, row, strict=True)), option=orjson.OPT_SERIALIZE_NUMPY
+                )
+                for row in zip(*values.values(), strict=True)
+            ]
+            columns["raw_payload"] = pa.array(payloads, pa.binary()).cast(pa.string())
+        else:
+            columns["raw_payload"] = pa.nulls(num_rows, pa.string())
+        
+        return pa.table(columns)
+
+    @staticmethod
+    def _column_values(column: "pa.ChunkedArray") -> List[Any]:
+        """
+        Convert an Arrow column to a list of Python objects.
+        
+        Timestamps are converted through pandas, which builds datetime
+        objects much faster than Arrow's per-value conversion.
+        
+        Args:
+            column: Arrow column
+            
+        Returns:
+            List of Python values with nulls as None
+        """
+        import pyarrow as pa
+        
+        if not pa.types.is_timestamp(column.type):
+            return column.to_pylist()
+        
+        series = column.to_pandas()
+        datetimes = series.array.to_pydatetime().tolist()
+        if column.null_count:
+            # Only the null positions are touched; the rest stay as converted
+            for index in series.isna().to_numpy().nonzero()[0].tolist():
+                datetimes[index] = None
+        return datetimes
+
+    @staticmethod
+    def _prepare_table(table: "pa.Table") -> "pa.Table":
+        """
+        Make a table's values convertible to plain Python objects.
+        
+        Drops stored pandas index columns, replaces NaN with null and
+        truncates nanosecond timestamps to microseconds so they convert
+        to datetime objects.
+        
+        Args:
+            table: Arrow table read from a parquet file
+            
+        Returns:
+            Cleaned Arrow table
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        pandas_metadata = table.schema.pandas_metadata or {}
+        index_columns = [
+            name for name in pandas_metadata.get("index_columns", []) if isinstance(name, str)
+        ]
+        if index_columns:
+            table = table.drop_columns(index_columns)
+        
+        for index, field in enumerate(table.schema):
+            column = table.column(index)
+            if pa.types.is_floating(field.type):
+                column = pc.if_else(pc.is_nan(column), pa.scalar(None, field.type), column)
+            elif pa.types.is_timestamp(field.type) and field.type.unit == "ns":
+                column = column.cast(pa.timestamp("us", tz=field.type.tz), safe=False)
+            else:
+                continue
+            table = table.set_column(index, field.name, column)
+        
+        return table
 
     @staticmethod
-    def _normalize_timestamp(ts: Any) -> datetime:
+    def _normalize_timestamps(ts: "pa.ChunkedArray") -> "pa.ChunkedArray":
         """
-        Normalize timestamp to UTC-aware datetime.
+        Normalize a timestamp column to UTC.
         
         Args:
-            ts: Timestamp value (various formats)
+            ts: Timestamp values (timestamps, ISO strings or Unix seconds)
             
         Returns:
-            UTC-aware datetime object
-        """
-        if isinstance(ts, pd.Timestamp):
-            dt = ts.to_pydatetime()
-        elif isinstance(ts, datetime):
-            dt = ts
-        elif isinstance(ts, str):
-            dt = pd.to_datetime(ts).to_pydatetime()
-        elif isinstance(ts, (int, float)):
+            Column of UTC timestamps
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        utc = pa.timestamp("us", tz="UTC")
+        
+        if pa.types.is_timestamp(ts.type) or pa.types.is_null(ts.type):
+            # Naive values are taken as UTC, aware values are converted
+            return ts.cast(utc)
+        
+        if pa.types.is_integer(ts.type):
             # Assume Unix timestamp
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-        else:
-            raise ValueError(f"Unsupported timestamp type: {type(ts)}")
+            return pc.multiply(ts.cast(pa.int64()), 1_000_000).cast(utc)
         
-        # Ensure UTC timezone
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
+        if pa.types.is_floating(ts.type):
+            micros = pc.round(pc.multiply(ts.cast(pa.float64()), 1_000_000))
+            return micros.cast(pa.int64()).cast(utc)
+        
+        # Strings may mix offsets and naive values, which pandas handles
+        import pandas as pd
         
-        return dt
+        normalized = pd.to_datetime(ts.to_pandas(), utc=True)
+        return pa.chunked_array([pa.array(normalized)]).cast(utc, safe=False)
@@ -4,30 +4,46 @@ import argparse
 import logging
 import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
-
-from dateutil import parser as date_parser
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Optional
 
 from ..common.logging import setup_structured_logging
 from .config import ETLConfig
-from .loader import TWAPLoader
 from .parser import TWAPParser
-from .s3_client import S3Client
 
-# Configure structured logging
-use_json_logs = os.getenv("LOG_FORMAT", "json").lower() == "json"
-log_level = os.getenv("LOG_LEVEL", "INFO")
-setup_structured_logging(level=log_level, use_json=use_json_logs)
+# SQLAlchemy, boto3 and pyarrow are imported only by the code paths that need them
+if TYPE_CHECKING:
+    import pyarrow as pa
+    
+    from .loader import TWAPLoader
+    from .s3_client import S3Client
 
 logger = logging.getLogger(__name__)
 
+# Listed objects checked against the ingest log per query (one listing page)
+LIST_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=1)
+def _get_loader() -> "TWAPLoader":
+    """Create the database loader on first use."""
+    from .loader import TWAPLoader
+    
+    return TWAPLoader(flush_every=ETLConfig.FLUSH_EVERY)
+
 
 def process_s3_object(
-    s3_client: S3Client,
-    loader: TWAPLoader,
+    s3_client: "S3Client",
+    loader: "TWAPLoader",
     object_key: str,
-    last_modified: datetime
+    last_modified: datetime,
+    download: Optional["Future[bytes]"] = None,
+    parsed: Optional["Future[pa.Table]"] = None,
+    in_watermark: bool = True
 ) -> bool:
     """
     Process a single S3 object.
@@ -37,6 +53,9 @@ def process_s3_object(
         loader: Database loader instance
         object_key: S3 object key
         last_modified: Object's last modified timestamp
+        download: Optional prefetched download of the object's content
+        parsed: Optional parse of the prefetched download, run ahead of loading
+        in_watermark: Whether a success may advance the ingest watermark
         
     Returns:
         True if successful, False otherwise
@@ -44,25 +63,35 @@ def process_s3_object(
     try:
         logger.info(f"Processing object: {object_key}")
         
-        # Download object
+        # Download object (or wait for the prefetched download)
         try:
-            content = s3_client.download_object(object_key)
+            if download is None:
+                content = s3_client.download_object(object_key)
+            else:
+                content = download.result()
         except Exception as e:
             logger.error(f"Failed to download {object_key}: {e}")
-            loader.mark_object_processed(object_key, last_modified, 0, f"Download error: {e}")
+            loader.mark_object_processed(
+                object_key, last_modified, 0, f"Download error: {e}", in_watermark=in_watermark
+            )
             return False
         
-        # Parse parquet
+        # Parse parquet (or wait for the parse running ahead)
         try:
-            records = TWAPParser.parse_parquet(content, object_key)
+            if parsed is None:
+                records = TWAPParser.parse_parquet_table(content, object_key)
+            else:
+                records = parsed.result()
         except Exception as e:
             logger.error(f"Failed to parse {object_key}: {e}")
-            loader.mark_object_processed(object_key, last_modified, 0, f"Parse error: {e}")
+            loader.mark_object_processed(
+                object_key, last_modified, 0, f"Parse error: {e}", in_watermark=in_watermark
+            )
             return False
         
         if not records:
             logger.warning(f"No records found in {object_key}")
-            loader.mark_object_processed(object_key, last_modified, 0)
+            loader.mark_object_processed(object_key, last_modified, 0, in_watermark=in_watermark)
             return True
         
         # Load into database
@@ -70,16 +99,20 @@ def process_s3_object(
             rows_inserted = loader.load_records(records, object_key)
         except Exception as e:
             logger.error(f"Failed to load records from {object_key}: {e}")
-            loader.mark_object_processed(object_key, last_modified, 0, f"Load error: {e}")
+            loader.mark_object_processed(
+                object_key, last_modified, 0, f"Load error: {e}", in_watermark=in_watermark
+            )
             return False
         
-        # Mark as processed
+        # Mark as processed; this may commit the batch, and a failed commit
+        # rolls back this object's load along with the rest of the batch
         try:
-            loader.mark_object_processed(object_key, last_modified, rows_inserted)
+            loader.mark_object_processed(
+                object_key, last_modified, rows_inserted, in_watermark=in_watermark
+            )
         except Exception as e:
-            logger.error(f"Failed to mark {object_key} as processed (but data was loaded): {e}")
-            # Data was successfully loaded, so we consider this a success
-            return True
+            logger.error(f"Failed to commit {object_key}, marked for retry: {e}")
+            return False
         
         logger.info(f"Successfully processed {object_key}: {rows_inserted} rows")
         return True
@@ -88,13 +121,20 @@ def process_s3_object(
         # Catch-all for any unexpected errors
         logger.error(f"Unexpected error processing {object_key}: {e}", exc_info=True)
         try:
-            loader.mark_object_processed(object_key, last_modified, 0, f"Unexpected error: {e}")
+            loader.mark_object_processed(
+                object_key, last_modified, 0, f"Unexpected error: {e}", in_watermark=in_watermark
+            )
         except Exception:
             logger.error(f"Failed to mark {object_key} as failed in ingest log")
         return False
 
 
-def process_local_file(loader: TWAPLoader, filepath: str) -> bool:
+def _parse_download(download: "Future[bytes]", object_key: str) -> "pa.Table":
+    """Parse a prefetched download once its content has arrived."""
+    return TWAPParser.parse_parquet_table(download.result(), object_key)
+
+
+def process_local_file(loader: "TWAPLoader", filepath: str) -> bool:
     """
     Process a local parquet file.
     
@@ -108,15 +148,11 @@ def process_local_file(loader: TWAPLoader, filepath: str) -> bool:
     try:
         logger.info(f"Processing local file: {filepath}")
         
-        # Parse parquet
-        records = TWAPParser.parse_parquet_file(filepath, f"local:{filepath}")
-        
-        if not records:
-            logger.warning(f"No records found in {filepath}")
-            return True
-        
-        # Load into database
-        rows_inserted = loader.load_records(records, f"local:{filepath}")
+        # Parse and load batch by batch, so large files never sit in memory whole
+        s3_object_key = f"local:{filepath}"
+        batches = TWAPParser.iter_parquet_file_tables(filepath, s3_object_key)
+        rows_inserted = loader.load_batches(batches, s3_object_key)
+        loader.flush()
         
         logger.info(f"Successfully processed {filepath}: {rows_inserted} rows")
         return True
@@ -126,48 +162,101 @@ def process_local_file(loader: TWAPLoader, filepath: str) -> bool:
         return False
 
 
-def run_incremental(s3_client: S3Client, loader: TWAPLoader, since: Optional[datetime] = None):
+def run_incremental(
+    s3_client: "S3Client",
+    loader: "TWAPLoader",
+    since: Optional[datetime] = None,
+    max_workers: Optional[int] = None
+):
     """
     Run incremental ETL process.
     
     Args:
         s3_client: S3 client instance
         loader: Database loader instance
-        since: Optional datetime to filter objects
+        since: Optional datetime to filter objects (defaults to the ingest watermark);
+            objects loaded from an explicit since do not advance the watermark
+        max_workers: Concurrent downloads (defaults to ETLConfig.DOWNLOAD_WORKERS)
     """
     logger.info("Starting incremental ETL process")
     
-    # Get list of S3 objects
-    objects = s3_client.list_objects(since=since)
+    # Only list objects modified since the ingest watermark. Successes count
+    # toward the watermark only when everything since it was listed.
+    in_watermark = since is None
+    if since is None:
+        since = loader.get_last_ingested_watermark()
+        if since is not None:
+            logger.info(f"Resuming from ingest watermark {since}")
     
-    if not objects:
+    # Stream the listing and filter out already processed objects a batch at
+    # a time, so only unprocessed objects are held in memory
+    listing = s3_client.iter_objects(since=since)
+    new_objects = []
+    listed_count = 0
+    
+    while True:
+        batch = list(islice(listing, LIST_BATCH_SIZE))
+        if not batch:
+            break
+        
+        listed_count += len(batch)
+        unprocessed = loader.get_unprocessed_keys([obj["key"] for obj in batch])
+        new_objects.extend(obj for obj in batch if obj["key"] in unprocessed)
+    
+    if not listed_count:
         logger.info("No new objects to process")
         return
     
-    # Get already processed objects
-    processed = loader.get_processed_objects()
-    
-    # Filter out already processed objects
-    new_objects = [obj for obj in objects if obj["key"] not in processed]
+    # Process oldest first so committed work always advances the watermark
+    new_objects.sort(key=lambda obj: obj["last_modified"])
     
-    logger.info(f"Found {len(new_objects)} new objects to process (out of {len(objects)} total)")
+    logger.info(f"Found {len(new_objects)} new objects to process (out of {listed_count} total)")
     
     # Process each object
     success_count = 0
     fail_count = 0
     
-    for obj in new_objects:
-        success = process_s3_object(
-            s3_client,
-            loader,
-            obj["key"],
-            obj["last_modified"]
-        )
+    # Downloads run on a thread pool, bounded to a window of prefetched objects.
+    # The next object is parsed on its own thread while the current one loads;
+    # loading stays on this thread so DB work remains ordered.
+    workers = max(max_workers or ETLConfig.DOWNLOAD_WORKERS, 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-download") as pool, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="parquet-parse") as parse_pool:
+        remaining = iter(new_objects)
+        pending = deque()
+        
+        def prefetch(count: int):
+            for obj in islice(remaining, count):
+                pending.append([obj, pool.submit(s3_client.download_object, obj["key"]), None])
         
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+        prefetch(workers * 2)
+        
+        while pending:
+            obj, download, parsed = pending.popleft()
+            prefetch(1)
+            
+            # Parse one object ahead so at most one parsed batch waits in memory
+            if pending:
+                upcoming = pending[0]
+                upcoming[2] = parse_pool.submit(_parse_download, upcoming[1], upcoming[0]["key"])
+            
+            success = process_s3_object(
+                s3_client,
+                loader,
+                obj["key"],
+                obj["last_modified"],
+                download=download,
+                parsed=parsed,
+                in_watermark=in_watermark
+            )
+            
+            if success:
+                success_count += 1
+            else:
+                fail_count += 1
+    
+    # Commit objects left over from the last partial batch
+    loader.flush()
     
     logger.info(
         f"ETL process completed: {success_count} succeeded, {fail_count} failed"
@@ -205,22 +294,40 @@ def main():
         help="Process a local parquet file (for testing)"
     )
     
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=ETLConfig.DOWNLOAD_WORKERS,
+        help="Concurrent S3 downloads (default: ETL_DOWNLOAD_WORKERS)"
+    )
+    
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Drop secondary indexes during an incremental run and rebuild them afterwards"
+    )
+    
     args = parser.parse_args()
     
+    # Configure structured logging
+    use_json_logs = os.getenv("LOG_FORMAT", "json").lower() == "json"
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+    setup_structured_logging(level=log_level, use_json=use_json_logs)
+    
     try:
         # Validate configuration
         ETLConfig.validate()
         
-        # Initialize loader
-        loader = TWAPLoader()
-        
         # Handle local file processing
         if args.local_file:
-            success = process_local_file(loader, args.local_file)
+            success = process_local_file(_get_loader(), args.local_file)
             sys.exit(0 if success else 1)
         
-        # Initialize S3 client
-        s3_client = S3Client()
+        # Initialize S3 client and loader
+        from .s3_client import S3Client
+        
+        s3_client = S3Client(max_pool_connections=max(10, args.max_workers))
+        loader = _get_loader()
         
         # Handle single object processing
         if args.object_key:
@@ -230,24 +337,35 @@ def main():
                 s3_client,
                 loader,
                 args.object_key,
-                metadata["last_modified"]
+                metadata["last_modified"],
+                in_watermark=False
             )
+            loader.flush()
             sys.exit(0 if success else 1)
         
         # Handle incremental processing
         since_date = None
         if args.since:
-            since_date = date_parser.isoparse(args.since)
+            since_date = datetime.fromisoformat(args.since)
             logger.info(f"Filtering objects since {since_date}")
         
-        run_incremental(s3_client, loader, since=since_date)
+        if not args.bulk:
+            run_incremental(s3_client, loader, since=since_date, max_workers=args.max_workers)
+            return
+        
+        loader.begin_bulk()
+        try:
+            run_incremental(s3_client, loader, since=since_date, max_workers=args.max_workers)
+        finally:
+            loader.end_bulk()
         
     except Exception as e:
         logger.error(f"ETL process failed: {e}")
         sys.exit(1)
     finally:
-        if 'loader' in locals():
-            loader.close()
+        # Close the loader only if one was created
+        if _get_loader.cache_info().currsize:
+            _get_loader().close()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 """S3 client with requester-pays support."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
 
 import boto3
 from botocore.config import Config
@@ -12,77 +14,124 @@ from .config import ETLConfig
 
 logger = logging.getLogger(__name__)
 
+# Most HEAD results each S3Client keeps; the oldest is evicted first
+METADATA_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=4)
+def _get_boto3_client(region: str, max_pool_connections: int):
+    """
+    Create a boto3 S3 client, shared by every S3Client with the same settings.
+    
+    Building a client loads the service model and sets up signing, so it is
+    done once per process; boto3 clients are thread-safe.
+    
+    Args:
+        region: AWS region
+        max_pool_connections: HTTP connection pool size
+        
+    Returns:
+        boto3 S3 client
+    """
+    # Configure retries for transient failures. Standard mode retries
+    # throttling and 5xx errors with jittered exponential backoff; adaptive
+    # mode would also rate-limit request dispatch client-side, capping the
+    # concurrent downloads this client is sized for.
+    config = Config(
+        retries={
+            'max_attempts': 5,
+            'mode': 'standard'
+        },
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=60,
+        max_pool_connections=max_pool_connections
+    )
+    
+    return boto3.client("s3", region_name=region, config=config)
+
+
+@lru_cache(maxsize=1)
+def _get_range_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Create the thread pool that fetches byte-range parts of large objects.
+    
+    One pool is shared by every S3Client and download in the process, so
+    clients do not each leave idle threads behind.
+    
+    Args:
+        max_workers: Number of concurrent range requests
+        
+    Returns:
+        Shared thread pool
+    """
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-range")
+
 
 class S3Client:
     """S3 client wrapper that always uses RequestPayer for requester-pays buckets."""
 
-    def __init__(self):
-        """Initialize S3 client with retry configuration."""
-        # Configure retries for transient failures
-        config = Config(
-            retries={
-                'max_attempts': 3,
-                'mode': 'adaptive'  # Use adaptive retry mode for better handling
-            },
-            connect_timeout=5,
-            read_timeout=60
-        )
+    def __init__(self, max_pool_connections: Optional[int] = None):
+        """
+        Initialize S3 client with retry configuration.
+        
+        Args:
+            max_pool_connections: HTTP connection pool size (defaults to one
+                connection per configured download worker)
+        """
+        if max_pool_connections is None:
+            max_pool_connections = max(10, ETLConfig.DOWNLOAD_WORKERS)
         
-        self.s3 = boto3.client("s3", region_name=ETLConfig.AWS_REGION, config=config)
+        # Byte-range parts of large objects share one pool across downloads
+        self.chunk_size = ETLConfig.DOWNLOAD_CHUNK_SIZE
+        range_workers = max(ETLConfig.RANGE_WORKERS, 1)
+        self._range_pool = _get_range_pool(range_workers)
+        
+        # One pooled connection per concurrent download or range part
+        self.s3 = _get_boto3_client(ETLConfig.AWS_REGION, max_pool_connections + range_workers)
         self.bucket = ETLConfig.AWS_S3_BUCKET
         self.prefix = ETLConfig.AWS_S3_PREFIX
         self.request_payer = ETLConfig.AWS_REQUEST_PAYER
+        
+        # HEAD results, kept for this client's lifetime (one ETL run)
+        self._metadata_cache: Dict[str, dict] = {}
 
-    def list_objects(
+    def iter_objects(
         self, since: Optional[datetime] = None
-    ) -> List[dict]:
+    ) -> Iterator[dict]:
         """
-        List all objects under the configured prefix.
+        Iterate over all objects under the configured prefix.
+        
+        Listing pages are fetched lazily, so callers can start work on the
+        first page while later pages are still being requested.
         
         Args:
             since: Optional datetime to filter objects by LastModified
             
-        Returns:
-            List of object metadata dictionaries
+        Yields:
+            Object metadata dictionaries
         """
-        objects = []
-        continuation_token = None
-        
         logger.info(f"Listing objects in s3://{self.bucket}/{self.prefix}")
         
+        paginator = self.s3.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=self.prefix,
+            RequestPayer=self.request_payer,
+        )
+        
         try:
-            while True:
-                kwargs = {
-                    "Bucket": self.bucket,
-                    "Prefix": self.prefix,
-                    "RequestPayer": self.request_payer,
-                }
-                
-                if continuation_token:
-                    kwargs["ContinuationToken"] = continuation_token
-                
-                response = self.s3.list_objects_v2(**kwargs)
-                
-                if "Contents" in response:
-                    for obj in response["Contents"]:
-                        # Filter by last modified if specified
-                        if since and obj["LastModified"] < since:
-                            continue
-                        
-                        objects.append({
-                            "key": obj["Key"],
-                            "last_modified": obj["LastModified"],
-                            "size": obj["Size"],
-                        })
-                
-                # Check if there are more objects
-                if not response.get("IsTruncated"):
-                    break
-                
-                continuation_token = response.get("NextContinuationToken")
-            
-            logger.info(f"Found {len(objects)} objects")
-            return objects
+            for page in pages:
+                for obj in page.get("Contents", ()):
+                    # Filter by last modified if specified
+                    if since and obj["LastModified"] < since:
+                        continue
+                    
+                    yield {
+                        "key": obj["Key"],
+                        "last_modified": obj["LastModified"],
+                        "size": obj["Size"],
+                    }
             
         except ClientError as e:
             logger.error(f"Error listing S3 objects: {e}")
@@ -92,22 +141,47 @@ class S3Client:
         """
         Download an object from S3.
         
+        The first chunk_size bytes are requested with a ranged GET, whose
+        Content-Range reports the object size. Larger objects then fetch
+        their remaining parts concurrently into a preallocated buffer.
+        
         Args:
             key: S3 object key
             
         Returns:
-            Object content as bytes
+            Object content as bytes (a bytearray for multi-part downloads)
         """
         logger.info(f"Downloading s3://{self.bucket}/{key}")
         
         try:
-            response = self.s3.get_object(
-                Bucket=self.bucket,
-                Key=key,
-                RequestPayer=self.request_payer
-            )
+            try:
+                response = self._get_range(key, 0)
+            except ClientError as e:
+                # Empty objects have no satisfiable range
+                if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                    return b""
+                raise
+            
+            # A full read() is sized from Content-Length and allocated once.
+            # Prefetched downloads are alive concurrently, so each one gets
+            # its own bytes rather than a shared reusable buffer.
+            first_part = response["Body"].read()
+            size = int(response["ContentRange"].rsplit("/", 1)[1])
+            
+            if size <= len(first_part):
+                content = first_part
+            else:
+                content = bytearray(size)
+                content[:len(first_part)] = first_part
+                etag = response["ETag"]
+                
+                def fetch(start: int):
+                    part = self._get_range(key, start, etag)["Body"].read()
+                    content[start:start + len(part)] = part
+                
+                starts = range(len(first_part), size, self.chunk_size)
+                list(self._range_pool.map(fetch, starts))
             
-            content = response["Body"].read()
             logger.info(f"Downloaded {len(content)} bytes")
             return content
             
@@ -115,16 +189,48 @@ class S3Client:
             logger.error(f"Error downloading S3 object {key}: {e}")
             raise
 
+    def _get_range(self, key: str, start: int, etag: Optional[str] = None) -> dict:
+        """
+        Request one chunk_size byte range of an object.
+        
+        Args:
+            key: S3 object key
+            start: Offset of the first byte
+            etag: ETag the object must still match, so parts of a multi-part
+                download all come from the same version
+            
+        Returns:
+            get_object response
+        """
+        kwargs = {
+            "Bucket": self.bucket,
+            "Key": key,
+            "RequestPayer": self.request_payer,
+            "Range": f"bytes={start}-{start + self.chunk_size - 1}",
+        }
+        if etag is not None:
+            kwargs["IfMatch"] = etag
+        
+        return self.s3.get_object(**kwargs)
+
     def get_object_metadata(self, key: str) -> dict:
         """
         Get metadata for a single S3 object.
         
+        Results are cached on this client, up to METADATA_CACHE_SIZE keys,
+        so repeated lookups of a key during a run cost one HEAD request;
+        failed lookups are not cached.
+        
         Args:
             key: S3 object key
             
         Returns:
             Object metadata dictionary
         """
+        metadata = self._metadata_cache.get(key)
+        if metadata is not None:
+            return metadata
+        
         try:
             response = self.s3.head_object(
                 Bucket=self.bucket,
@@ -132,7 +238,7 @@ class S3Client:
                 RequestPayer=self.request_payer
             )
             
-            return {
+            metadata = {
                 "key": key,
                 "last_modified": response["LastModified"],
                 "size": response["ContentLength"],
@@ -141,3 +247,8 @@ class S3Client:
         except ClientError as e:
             logger.error(f"Error getting object metadata for {key}: {e}")
             raise
+        
+        if len(self._metadata_cache) >= METADATA_CACHE_SIZE:
+            del self._metadata_cache[next(iter(self._metadata_cache))]
+        self._metadata_cache[key] = metadata
+        return metadata
@@ -72,19 +72,33 @@ sample_data = [
 ]
 
 
+def write_sample_parquet(output_path: Path):
+    """
+    Write the sample TWAP data to a parquet file.
+    
+    The Arrow table is built straight from the rows; repeated strings are
+    dictionary-encoded and pages ZSTD-compressed.
+    """
+    pq.write_table(
+        pa.Table.from_pylist(sample_data),
+        output_path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=["state_coin", "state_user", "state_side", "status"],
+        write_statistics=True,
+    )
+
+
 def create_sample_parquet():
     """Create sample parquet file for testing."""
-    # Create DataFrame
-    df = pd.DataFrame(sample_data)
-    
     # Ensure output directory exists
     output_dir = Path(__file__).parent / "data"
     output_dir.mkdir(exist_ok=True)
     
-    # Save as parquet
     output_path = output_dir / "sample_twap.parquet"
-    df.to_parquet(output_path, index=False)
+    write_sample_parquet(output_path)
     
+    df = pd.read_parquet(output_path)
     print(f"Created sample parquet file: {output_path}")
     print(f"Rows: {len(df)}")
     print(f"\nColumns: {list(df.columns)}")
@@ -0,0 +1,35 @@
+"""Tests for the in-process API response cache."""
+
+from src.api.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the oldest untouched entry is evicted once maxsize is exceeded."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    
+    # Touch "a" so "b" becomes least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire(monkeypatch):
+    """Test entries are dropped after the TTL and TTL 0 disables caching."""
+    now = [1000.0]
+    monkeypatch.setattr("src.api.cache.time.monotonic", lambda: now[0])
+    
+    cache = TTLCache(maxsize=10, ttl=3)
+    cache.set("key", b"body")
+    assert cache.get("key") == b"body"
+    
+    now[0] += 3
+    assert cache.get("key") is None
+    
+    disabled = TTLCache(maxsize=10, ttl=0)
+    disabled.set("key", b"body")
+    assert disabled.get("key") is None
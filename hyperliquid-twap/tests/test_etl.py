@@ -4,10 +4,30 @@ from pathlib import Path
 
 import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
-from src.etl.loader import TWAPLoader
 from src.etl.parser import TWAPParser
 
+COUNT_ROWS = text("SELECT COUNT(*) FROM twap_status")
+FAILED_KEYS = text("SELECT s3_object_key FROM etl_s3_ingest_log WHERE error_text IS NOT NULL")
+
+
+class FakeS3Client:
+    """In-memory stand-in for S3Client that serves the same content for every key."""
+    
+    def __init__(self, objects, content):
+        self.objects = objects
+        self.content = content
+    
+    def iter_objects(self, since=None):
+        for key, last_modified in self.objects.items():
+            if since and last_modified < since:
+                continue
+            yield {"key": key, "last_modified": last_modified, "size": len(self.content)}
+    
+    def download_object(self, key):
+        return self.content
+
 
 def test_parse_sample_parquet(sample_parquet_path):
     """Test parsing sample parquet file."""
@@ -28,7 +48,25 @@ def test_parse_sample_parquet(sample_parquet_path):
     assert record["s3_object_key"] == "test_key"
 
 
-def test_loader_idempotency(test_db, sample_parquet_path):
+def test_parse_projected_columns(sample_parquet_path):
+    """Test that a column projection fills only the requested columns."""
+    if not sample_parquet_path.exists():
+        pytest.skip("Sample parquet file not found")
+    
+    records = TWAPParser.parse_parquet_file(
+        str(sample_parquet_path), "test_key", columns=["twap_id", "wallet", "ts"]
+    )
+    
+    assert len(records) > 0
+    
+    record = records[0]
+    assert record["twap_id"] and record["wallet"] and record["ts"]
+    assert record["asset"] is None
+    assert record["raw_payload"] is None
+    assert record["s3_object_key"] == "test_key"
+
+
+def test_loader_idempotency(rollback_loader, sample_parquet_path):
     """Test that loading the same data twice doesn't duplicate rows."""
     if not sample_parquet_path.exists():
         pytest.skip("Sample parquet file not found")
@@ -36,41 +74,175 @@ def test_loader_idempotency(test_db, sample_parquet_path):
     # Parse sample data
     records = TWAPParser.parse_parquet_file(str(sample_parquet_path), "test_key")
     
-    # Create loader (use sync engine from test fixture)
-    loader = TWAPLoader()
-    
     # First load
-    rows_first = loader.load_records(records, "test_key")
+    rows_first = rollback_loader.load_records(records, "test_key")
     
     # Second load (should insert 0 rows due to conflict)
-    rows_second = loader.load_records(records, "test_key")
+    rows_second = rollback_loader.load_records(records, "test_key")
     
     assert rows_first > 0
     assert rows_second == 0
     
     # Verify total rows in database
-    result = test_db.execute(text("SELECT COUNT(*) FROM twap_status"))
+    result = rollback_loader.session.execute(COUNT_ROWS)
     count = result.scalar()
     assert count == rows_first
+
+
+def test_loader_accepts_arrow_table(rollback_loader, sample_parquet_path):
+    """Test that a columnar parse loads the same rows as record dictionaries."""
+    if not sample_parquet_path.exists():
+        pytest.skip("Sample parquet file not found")
+    
+    records = TWAPParser.parse_parquet_file(str(sample_parquet_path), "test_key")
+    table = TWAPParser.parse_parquet_file_table(str(sample_parquet_path), "test_key")
+    assert table.num_rows == len(records)
+    
+    # Rows loaded from the table conflict with the same rows as records
+    rollback_loader.load_records(table, "test_key")
+    rows_second = rollback_loader.load_records(records, "test_key")
+    
+    assert rows_second == 0
+    
+    result = rollback_loader.session.execute(COUNT_ROWS)
+    assert result.scalar() == len(records)
+
+
+def test_loader_loads_batches(rollback_loader, sample_parquet_path):
+    """Test that a file parsed in batches loads every row in one merge."""
+    import pyarrow as pa
+    
+    if not sample_parquet_path.exists():
+        pytest.skip("Sample parquet file not found")
+    
+    table = TWAPParser.parse_parquet_file_table(str(sample_parquet_path), "test_batches")
+    batches = list(
+        TWAPParser.iter_parquet_file_tables(str(sample_parquet_path), "test_batches", batch_size=2)
+    )
+    
+    assert all(batch.num_rows <= 2 for batch in batches)
+    assert pa.concat_tables(batches).equals(table)
+    
+    # A wallet no other test uses, so every row is new
+    batches = [
+        batch.set_column(
+            batch.schema.get_field_index("wallet"),
+            "wallet",
+            pa.repeat("0xbatch_wallet", batch.num_rows),
+        )
+        for batch in batches
+    ]
     
-    loader.close()
+    rows_inserted = rollback_loader.load_batches(iter(batches), "test_batches")
+    
+    assert rows_inserted == table.num_rows
+    assert rollback_loader.load_batches(iter(batches), "test_batches") == 0
 
 
-def test_ingest_log_tracking(test_db):
+def test_ingest_log_tracking(rollback_loader):
     """Test that processed objects are tracked in ingest log."""
     from datetime import datetime, timezone
     
-    loader = TWAPLoader()
-    
     # Mark object as processed
-    loader.mark_object_processed(
+    rollback_loader.mark_object_processed(
         "s3://test/key.parquet",
         datetime.now(timezone.utc),
         100
     )
     
     # Check it's in the processed set
-    processed = loader.get_processed_objects()
+    processed = rollback_loader.get_processed_objects()
     assert "s3://test/key.parquet" in processed
+
+
+def test_unprocessed_keys_and_watermark(rollback_loader):
+    """Test failed objects stay unprocessed and hold back the watermark."""
+    from datetime import datetime, timezone
+    
+    failed_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    
+    rollback_loader.mark_object_processed("s3://test/ok.parquet", datetime.now(timezone.utc), 10)
+    rollback_loader.mark_object_processed("s3://test/failed.parquet", failed_at, 0, "Parse error")
+    
+    unprocessed = rollback_loader.get_unprocessed_keys([
+        "s3://test/ok.parquet",
+        "s3://test/failed.parquet",
+        "s3://test/new.parquet",
+    ])
+    assert unprocessed == {"s3://test/failed.parquet", "s3://test/new.parquet"}
+    
+    watermark = rollback_loader.get_last_ingested_watermark()
+    assert watermark is not None and watermark <= failed_at
+
+
+def test_failed_flush_marks_batch_for_retry(rollback_loader, monkeypatch):
+    """Test objects in a batch whose commit fails are retried, not skipped."""
+    from datetime import datetime, timezone
+    
+    monkeypatch.setattr(rollback_loader, "flush_every", 2)
+    
+    # Fail the next commit only, as a dropped connection would
+    session = rollback_loader.session
+    commit = session.commit
+    
+    def failing_commit():
+        monkeypatch.setattr(session, "commit", commit)
+        raise OperationalError("COMMIT", None, Exception("connection lost"))
+    
+    monkeypatch.setattr(session, "commit", failing_commit)
+    
+    first_lost = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    rollback_loader.mark_object_processed("s3://test/lost1.parquet", first_lost, 10)
+    with pytest.raises(OperationalError):
+        rollback_loader.mark_object_processed(
+            "s3://test/lost2.parquet", datetime(2021, 1, 2, tzinfo=timezone.utc), 10
+        )
+    
+    # A later, newer batch commits successfully
+    rollback_loader.mark_object_processed(
+        "s3://test/later.parquet", datetime(2021, 1, 3, tzinfo=timezone.utc), 10
+    )
+    rollback_loader.flush()
+    
+    unprocessed = rollback_loader.get_unprocessed_keys([
+        "s3://test/lost1.parquet",
+        "s3://test/lost2.parquet",
+        "s3://test/later.parquet",
+    ])
+    assert unprocessed == {"s3://test/lost1.parquet", "s3://test/lost2.parquet"}
+    
+    # Failed entries are what hold the watermark behind the lost objects
+    failed = set(rollback_loader.session.execute(FAILED_KEYS).scalars())
+    assert {"s3://test/lost1.parquet", "s3://test/lost2.parquet"} <= failed
+    
+    watermark = rollback_loader.get_last_ingested_watermark()
+    assert watermark is not None and watermark <= first_lost
+
+
+def test_single_object_run_does_not_skip_older_objects(rollback_loader, sample_parquet_path):
+    """Test an --object-key run on the newest object leaves older ones to the next run."""
+    from datetime import datetime, timezone
+    
+    from src.etl.run import process_s3_object, run_incremental
+    
+    older = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    newest = datetime(2022, 1, 2, tzinfo=timezone.utc)
+    s3_client = FakeS3Client(
+        {"s3://test/older.parquet": older, "s3://test/newest.parquet": newest},
+        sample_parquet_path.read_bytes(),
+    )
+    
+    # What main() does for --object-key
+    assert process_s3_object(
+        s3_client, rollback_loader, "s3://test/newest.parquet", newest, in_watermark=False
+    )
+    rollback_loader.flush()
+    
+    # The next incremental run still lists and loads the older object
+    run_incremental(s3_client, rollback_loader, max_workers=1)
     
-    loader.close()
+    assert rollback_loader.get_unprocessed_keys([
+        "s3://test/older.parquet",
+        "s3://test/newest.parquet",
+    ]) == set()
+    assert rollback_loader.get_last_ingested_watermark() == older
@@ -0,0 +1,26 @@
+"""Tests for structured logging."""
+
+import io
+import logging
+
+import orjson
+
+from src.common import logging as structured_logging
+
+
+def test_records_are_written_by_background_listener(monkeypatch):
+    """Test queued records reach stdout once the listener is stopped."""
+    stream = io.StringIO()
+    monkeypatch.setattr(structured_logging.sys, "stdout", stream)
+    
+    structured_logging.setup_structured_logging(level="INFO")
+    try:
+        logger = structured_logging.StructuredLogger(logging.getLogger("test"))
+        logger.info("hello", wallet="0xabc")
+    finally:
+        structured_logging.stop_structured_logging()
+        logging.getLogger().handlers.clear()
+    
+    payload = orjson.loads(stream.getvalue().splitlines()[-1])
+    assert payload["message"] == "hello"
+    assert payload["wallet"] == "0xabc"
@@ -0,0 +1,65 @@
+"""Tests for API metrics collection."""
+
+from src.api.metrics import DurationHistogram, MetricsCollector
+
+
+def test_histogram_quantiles_within_precision():
+    """Test histogram quantiles stay within 1% of exact values."""
+    histogram = DurationHistogram()
+    durations = [i / 1000 for i in range(1, 1001)]  # 1ms .. 1s
+    for duration in durations:
+        histogram.record(duration)
+    
+    assert histogram.count == 1000
+    assert abs(histogram.total - sum(durations)) < 1e-9
+    
+    for q in (0.5, 0.95, 0.99):
+        exact = durations[int(len(durations) * q)]
+        assert abs(histogram.quantile(q) - exact) / exact <= 0.0101
+
+
+def test_histogram_clamps_out_of_range_values():
+    """Test values outside the tracked range land in the edge buckets."""
+    histogram = DurationHistogram()
+    histogram.record(0.0)
+    histogram.record(3600.0)
+    
+    assert histogram.buckets[0] == 1
+    assert histogram.buckets[-1] == 1
+    assert histogram.quantile(0.0) <= DurationHistogram.MIN_VALUE * DurationHistogram.GROWTH
+
+
+def test_prometheus_output_includes_quantiles():
+    """Test recorded requests are exported with count, sum and quantiles."""
+    collector = MetricsCollector()
+    collector.record_request("GET", "/healthz", 0.010, 200)
+    collector.record_request("GET", "/healthz", 0.020, 200)
+    
+    output = collector.get_prometheus_metrics()
+    
+    assert b'api_requests_total{endpoint="GET /healthz"} 2' in output
+    assert b'api_request_duration_seconds_count{endpoint="GET /healthz"} 2' in output
+    assert b'api_request_duration_seconds_sum{endpoint="GET /healthz"} 0.030' in output
+    assert b'api_request_duration_seconds{endpoint="GET /healthz",quantile="0.5"}' in output
+
+
+def test_prometheus_output_reused_within_ttl():
+    """Test repeated scrapes within the TTL reuse the rendered text."""
+    collector = MetricsCollector()
+    collector.record_request("GET", "/", 0.001, 200)
+    first = collector.get_prometheus_metrics()
+    
+    collector.record_request("GET", "/", 0.001, 200)
+    assert collector.get_prometheus_metrics() is first
+    
+    collector.RENDER_TTL = 0.0
+    collector._rendered = (b"", 0.0)
+    assert b'api_requests_total{endpoint="GET /"} 2' in collector.get_prometheus_metrics()
+
+
+def test_known_endpoints_are_pre_seeded():
+    """Test known endpoints are exported before their first request."""
+    collector = MetricsCollector(["GET /healthz"])
+    
+    assert b'api_requests_total{endpoint="GET /healthz"} 0' in collector.get_prometheus_metrics()
+    assert "GET /healthz" in collector.request_duration